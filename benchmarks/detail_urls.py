@@ -0,0 +1,93 @@
+"""
+Compares the per-detail `reverse` + `build_absolute_uri` of the offer detail links with the URL parts
+resolved once per page by `OfferDetailViewSerializer.get_details`. Runs without a database on in-memory
+offers with prefetched details.
+
+Usage (from the repository root):
+
+    python benchmarks/detail_urls.py --page-size 100 --details 3 --repeat 200
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_core.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-size', type=int, default=100, help="Offers per list page.")
+    parser.add_argument('--details', type=int, default=3, help="Details per offer.")
+    parser.add_argument('--repeat', type=int, default=200, help="Serialized pages per measurement.")
+    return parser.parse_args()
+
+
+def build_page(page_size, details_per_offer):
+    """
+    Returns unsaved offers whose `details` are served from a filled prefetch cache.
+    """
+    from offers_app.models import Offer, OfferDetail
+
+    offers = []
+    for offer_id in range(1, page_size + 1):
+        offer = Offer(id=offer_id, title=f"Offer {offer_id}", description="Benchmark")
+        details = OfferDetail.objects.none()
+        details._result_cache = [
+            OfferDetail(id=offer_id * details_per_offer + index, offer=offer) for index in range(details_per_offer)
+        ]
+        details._prefetch_done = True
+        offer._prefetched_objects_cache = {'details': details}
+        offers.append(offer)
+    return offers
+
+
+def per_detail_reverse(offers, request):
+    """
+    The previous implementation: one `reverse` and one `build_absolute_uri` call per detail.
+    """
+    from rest_framework.reverse import reverse
+
+    return [
+        [
+            {"id": detail.id, "url": request.build_absolute_uri(reverse("offerdetails-detail", args=[detail.id]))}
+            for detail in offer.details.all()
+        ]
+        for offer in offers
+    ]
+
+
+def resolved_once(offers, request):
+    """
+    The current implementation, with a fresh serializer per page as in a list request.
+    """
+    from offers_app.api.serializers import OfferListSerializer
+
+    serializer = OfferListSerializer(offers, many=True, context={'request': request}).child
+    return [serializer.get_details(offer) for offer in offers]
+
+
+def main():
+    args = parse_args()
+    import django
+    django.setup()
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    request = Request(APIRequestFactory().get('/api/offers/', SERVER_NAME='localhost'))
+    offers = build_page(args.page_size, args.details)
+    assert per_detail_reverse(offers, request) == resolved_once(offers, request)
+
+    links = args.page_size * args.details
+    print(f"{args.page_size} offers x {args.details} details = {links} links per page, {args.repeat} pages\n")
+    results = {}
+    for label, function in (("per-detail reverse", per_detail_reverse), ("resolved once per page", resolved_once)):
+        seconds = min(timeit.repeat(lambda: function(offers, request), number=args.repeat, repeat=3))
+        results[label] = seconds
+        print(f"{label:24} {seconds * 1000 / args.repeat:8.3f} ms/page  {seconds * 1e6 / (args.repeat * links):7.3f} us/link")
+    print(f"\nspeedup: {results['per-detail reverse'] / results['resolved once per page']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Seeds a throwaway SQLite database with a large dataset and prints the query plan and the average duration
+of the hot lookups, first with the composite indexes and constraints of the migrations and then after
+migrating back to the state before them.
+
+Usage (from the repository root):
+
+    python benchmarks/index_plans.py --offers 20000 --orders 100000 --reviews 50000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_core.settings')
+
+# The last migration of every app before its composite indexes and constraints were added
+MIGRATIONS_BEFORE_INDEXES = [
+    ('offers_app', '0006_offer_image_derivatives'),
+    ('orders_app', '0003_alter_order_business_user_alter_order_customer_user'),
+    ('profiles_app', '0005_userprofile_file_derivatives'),
+    ('reviews_app', '0003_alter_review_options'),
+]
+
+# The offer columns at `0006_offer_image_derivatives`, so the offer lookups also run after the rollback
+OFFER_COLUMNS_BEFORE_INDEXES = [
+    'id', 'title', 'image', 'description', 'user', 'created_at', 'updated_at',
+    'min_price', 'min_delivery_time', 'max_delivery_time', 'image_derivatives',
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--business-users', type=int, default=1000)
+    parser.add_argument('--customers', type=int, default=10000)
+    parser.add_argument('--offers', type=int, default=20000)
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--reviews', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=200, help="Executions per query for the timing.")
+    return parser.parse_args()
+
+
+def setup_database(path):
+    """
+    Points the default database at a temporary file, sets Django up and applies all migrations.
+    """
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.DATABASES['default']['NAME'] = path
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+
+def seed(args):
+    """
+    Bulk-inserts users, profiles, offers with three details each, orders and reviews.
+    """
+    from django.contrib.auth import get_user_model
+    from offers_app.models import Offer, OfferDetail
+    from orders_app.models import Order, OrderStatus
+    from profiles_app.models import UserProfile
+    from reviews_app.models import Review
+
+    rng = random.Random(42)
+    User = get_user_model()
+    User.objects.bulk_create(
+        [User(username=f"business{i}", type='business') for i in range(args.business_users)]
+        + [User(username=f"customer{i}", type='customer') for i in range(args.customers)],
+        batch_size=2000,
+    )
+    business_ids = list(User.objects.filter(type='business').values_list('id', flat=True))
+    customer_ids = list(User.objects.filter(type='customer').values_list('id', flat=True))
+    UserProfile.objects.bulk_create(
+        [UserProfile(user_id=user_id, type=user_type) for user_id, user_type in User.objects.filter(userprofile__isnull=True).values_list('id', 'type')],
+        batch_size=2000,
+    )
+
+    Offer.objects.bulk_create(
+        [Offer(title=f"Offer {i}", description="Seeded", user_id=rng.choice(business_ids)) for i in range(args.offers)],
+        batch_size=2000,
+    )
+    OfferDetail.objects.bulk_create(
+        [
+            OfferDetail(offer_id=offer_id, title=offer_type, revisions=1, delivery_time_in_days=rng.randint(1, 30),
+                        price=rng.randint(10, 1000), offer_type=offer_type)
+            for offer_id in Offer.objects.values_list('id', flat=True)
+            for offer_type in ('basic', 'standard', 'premium')
+        ],
+        batch_size=2000,
+    )
+    Offer.objects.all().update_detail_summary(touch=False)
+
+    statuses = [OrderStatus.IN_PROGRESS, OrderStatus.COMPLETED, OrderStatus.CANCELLED]
+    Order.objects.bulk_create(
+        [
+            Order(customer_user_id=rng.choice(customer_ids), business_user_id=rng.choice(business_ids), title="Order",
+                  revisions=1, delivery_time_in_days=3, price=100, offer_type='basic', status=rng.choice(statuses))
+            for _ in range(args.orders)
+        ],
+        batch_size=2000,
+    )
+
+    pairs = set()
+    while len(pairs) < min(args.reviews, len(business_ids) * len(customer_ids)):
+        pairs.add((rng.choice(business_ids), rng.choice(customer_ids)))
+    Review.objects.bulk_create(
+        [Review(business_user_id=business_id, reviewer_id=reviewer_id, rating=rng.randint(1, 5), description="Seeded")
+         for business_id, reviewer_id in pairs],
+        batch_size=2000,
+    )
+    return business_ids[len(business_ids) // 2], customer_ids[len(customer_ids) // 2]
+
+
+def get_cases(business_id, customer_id):
+    """
+    Returns the hot lookups as (label, queryset, model, names of the serving indexes or constraints) tuples.
+    """
+    from django.db.models import Min
+    from offers_app.models import Offer, OfferDetail
+    from orders_app.models import Order
+    from profiles_app.models import UserProfile
+    from reviews_app.models import Review
+
+    offer_id = Offer.objects.filter(user_id=business_id).values_list('id', flat=True).first() or 1
+    return [
+        ("OfferDetail by (offer, offer_type)", OfferDetail.objects.filter(offer_id=offer_id, offer_type='premium'),
+         OfferDetail, ['offerdetail_unique_offer_type']),
+        ("OfferDetail MIN(price) per offer", OfferDetail.objects.filter(offer_id=offer_id).values('offer').annotate(value=Min('price')),
+         OfferDetail, ['offerdetail_offer_price_idx']),
+        ("Offer list ordered by updated_at", Offer.objects.only(*OFFER_COLUMNS_BEFORE_INDEXES).order_by('updated_at', 'id')[:20],
+         Offer, ['offer_updated_at_id_idx']),
+        ("Order count by (business_user, status)", Order.objects.filter(business_user_id=business_id, status='in_progress').values('id'),
+         Order, ['order_business_status_idx']),
+        ("Orders of a customer by created_at", Order.objects.filter(customer_user_id=customer_id).order_by('-created_at')[:20],
+         Order, ['order_customer_created_idx']),
+        ("Orders of a business user by created_at", Order.objects.filter(business_user_id=business_id).order_by('-created_at')[:20],
+         Order, ['order_business_created_idx']),
+        ("Reviews of a business user by -updated_at", Review.objects.filter(business_user_id=business_id).order_by('-updated_at')[:20],
+         Review, ['review_business_updated_idx']),
+        ("Reviews by a reviewer by -updated_at", Review.objects.filter(reviewer_id=customer_id).order_by('-updated_at')[:20],
+         Review, ['review_reviewer_updated_idx']),
+        ("Business profiles by type", UserProfile.objects.filter(type='business').values('id'),
+         UserProfile, ['userprofile_type_idx']),
+    ]
+
+
+def measure(queryset, repeat):
+    """
+    Returns the query plan and the average duration in milliseconds of evaluating the queryset.
+    """
+    plan = queryset.explain()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        list(queryset.all())
+    return plan, (time.perf_counter() - start) * 1000 / repeat
+
+
+def unapply_index_migrations():
+    """
+    Migrates the apps back to the state before the index migrations and refreshes the planner statistics.
+    """
+    from django.core.management import call_command
+    from django.db import connection
+
+    for app_label, migration_name in MIGRATIONS_BEFORE_INDEXES:
+        call_command('migrate', app_label, migration_name, verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        setup_database(os.path.join(directory, 'benchmark.sqlite3'))
+        from django.db import connection
+
+        started = time.perf_counter()
+        business_id, customer_id = seed(args)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        print(f"Seeded in {time.perf_counter() - started:.1f}s\n")
+
+        cases = get_cases(business_id, customer_id)
+        with_indexes = [measure(queryset, args.repeat) for label, queryset, model, names in cases]
+        unapply_index_migrations()
+        without_indexes = [measure(queryset, args.repeat) for label, queryset, model, names in cases]
+
+        for (label, queryset, model, names), (plan, duration), (plan_without, duration_without) in zip(cases, with_indexes, without_indexes):
+            print(f"== {label} ({', '.join(names)})")
+            print(f"   with index    {duration:8.3f} ms  {' | '.join(plan.splitlines())}")
+            print(f"   without index {duration_without:8.3f} ms  {' | '.join(plan_without.splitlines())}\n")
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
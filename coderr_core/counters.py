@@ -0,0 +1,137 @@
+import atexit
+import logging
+import threading
+
+from django.apps import apps
+from django.db import connections
+from django.db.models import Case, F, Value, When
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCounter:
+    """
+    In-process counter that aggregates increments of an integer model field in memory and applies them
+    in batches, so hot read paths do not issue one UPDATE per hit.
+
+    Deltas are written with a single UPDATE per `chunk_size` rows, either by the background flusher every
+    `flush_interval` seconds, early once `max_pending` rows are buffered (bounding the memory), or at
+    interpreter exit. Deltas of a failed flush are merged back and retried, so counts are applied at least once
+    per process; increments still buffered when a process is killed are lost. Counting is best-effort and never
+    raises into the caller.
+    """
+    def __init__(self, model_label, field_name, flush_interval=10, max_pending=10000, chunk_size=500, using='default'):
+        self.model_label = model_label
+        self.field_name = field_name
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self.using = using
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def increment(self, pk, amount=1):
+        """
+        Adds `amount` to the buffered delta of the row. When the buffer is full it is handed to the background
+        flusher, or flushed in the calling thread if no flusher runs; a failed flush is logged and its deltas
+        stay buffered for the next one.
+        """
+        with self._lock:
+            self._pending[pk] = self._pending.get(pk, 0) + amount
+            full = len(self._pending) >= self.max_pending
+        if not full:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            self._wakeup.set()
+            return
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Flushing %s.%s counts failed, they are retried with the next flush.", self.model_label, self.field_name)
+
+    def pending(self):
+        """
+        Returns a copy of the buffered deltas by primary key.
+        """
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self):
+        """
+        Writes the buffered deltas to the database and returns the number of updated rows.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                return self.apply(pending)
+            except Exception:
+                with self._lock:
+                    for pk, delta in pending.items():
+                        self._pending[pk] = self._pending.get(pk, 0) + delta
+                raise
+
+    def apply(self, pending):
+        """
+        Adds the deltas to the field with one `UPDATE ... SET field = field + CASE ... END` per chunk of rows.
+        """
+        model = apps.get_model(self.model_label)
+        field = model._meta.get_field(self.field_name)
+        updated = 0
+        items = sorted(pending.items())
+        for start in range(0, len(items), self.chunk_size):
+            chunk = items[start:start + self.chunk_size]
+            delta = Case(
+                *[When(pk=pk, then=Value(amount)) for pk, amount in chunk],
+                default=Value(0), output_field=field,
+            )
+            updated += model._default_manager.using(self.using).filter(pk__in=[pk for pk, amount in chunk]).update(
+                **{self.field_name: F(self.field_name) + delta}
+            )
+        return updated
+
+    def start(self):
+        """
+        Starts the background flusher (once) and registers the final flush for interpreter exit.
+        Meant for serving processes; without it deltas are only written when the buffer is full.
+        """
+        if self._thread is not None or not self.flush_interval:
+            return
+        self._thread = threading.Thread(target=self.run, name=f'{self.model_label}.{self.field_name}-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def run(self):
+        """
+        Flushes every `flush_interval` seconds, or earlier when woken up by a full buffer, until stopped.
+        """
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                return
+            self.flush_safely()
+
+    def stop(self):
+        """
+        Stops the background flusher and writes the remaining deltas.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval)
+        self.flush_safely()
+
+    def flush_safely(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Flushing %s.%s counts failed, they are retried with the next flush.", self.model_label, self.field_name)
+        finally:
+            connections[self.using].close()
@@ -0,0 +1,158 @@
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional, without it uploads are served as originals only
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+# Sent with `sender=<model>`, `pk` and `derivatives` once the derivatives of an upload are stored.
+image_derivatives_ready = Signal()
+
+DEFAULT_DERIVATIVE_SIZES = {'thumbnail': (150, 150), 'card': (600, 400)}
+SAVE_FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG'}
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    """
+    Returns the process-wide worker pool, bounded to `IMAGE_PIPELINE_WORKERS` threads (default 2).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_PIPELINE_WORKERS', 2), thread_name_prefix='image-derivatives'
+            )
+        return _executor
+
+
+def schedule_image_derivatives(instance, field_name, derivatives_field):
+    """
+    Queues the derivative rendering of the instance's current upload once the surrounding transaction commits.
+    Runs inline when `IMAGE_PIPELINE_EAGER` is set (e.g. in tests) and does nothing without Pillow.
+    """
+    if Image is None:
+        return
+    args = (instance._meta.label, instance.pk, field_name, derivatives_field, getattr(instance, field_name).name)
+
+    def submit():
+        if getattr(settings, 'IMAGE_PIPELINE_EAGER', False):
+            generate_image_derivatives(*args)
+        else:
+            get_executor().submit(run_in_worker, *args)
+
+    transaction.on_commit(submit)
+
+
+def run_in_worker(*args):
+    """
+    Renders the derivatives on a pool thread and closes the thread's database connections afterwards.
+    """
+    try:
+        generate_image_derivatives(*args)
+    except Exception:
+        logger.exception("Rendering image derivatives failed for %s %s.", args[0], args[1])
+    finally:
+        connections.close_all()
+
+
+def generate_image_derivatives(model_label, pk, field_name, derivatives_field, source_name):
+    """
+    Renders the derivatives of `source_name` and stores their names on the instance. The update only applies
+    while the instance still references the same upload; derivatives of a meanwhile replaced upload are discarded.
+    """
+    model = apps.get_model(model_label)
+    derivatives = render_derivatives(source_name)
+    values = {derivatives_field: derivatives}
+    try:
+        if model._meta.get_field('updated_at').auto_now:
+            values['updated_at'] = timezone.now()  # queryset updates bypass auto_now
+    except FieldDoesNotExist:
+        pass
+    if model._default_manager.filter(pk=pk, **{field_name: source_name}).update(**values):
+        image_derivatives_ready.send(sender=model, pk=pk, derivatives=derivatives)
+    else:
+        delete_image_derivatives(derivatives)
+    return derivatives
+
+
+def render_derivatives(source_name):
+    """
+    Renders a downscaled copy of the image for every size in `IMAGE_DERIVATIVE_SIZES`, in the original format
+    and additionally as WebP when `IMAGE_DERIVATIVES_WEBP` is set. Returns the stored file names by derivative name.
+    """
+    sizes = getattr(settings, 'IMAGE_DERIVATIVE_SIZES', DEFAULT_DERIVATIVE_SIZES)
+    with default_storage.open(source_name, 'rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    directory, filename = os.path.split(source_name)
+    stem, ext = os.path.splitext(filename)
+    formats = {'': (ext.lower(), SAVE_FORMATS.get(ext.lower(), 'PNG'))}
+    if getattr(settings, 'IMAGE_DERIVATIVES_WEBP', True):
+        formats['_webp'] = ('.webp', 'WEBP')
+
+    derivatives = {}
+    for size_name, size in sizes.items():
+        derivative = image.copy()
+        derivative.thumbnail(size)
+        for suffix, (extension, image_format) in formats.items():
+            if image_format == 'JPEG' and derivative.mode not in ('RGB', 'L'):
+                rendered = derivative.convert('RGB')
+            else:
+                rendered = derivative
+            buffer = io.BytesIO()
+            rendered.save(buffer, format=image_format)
+            name = os.path.join(directory, 'derivatives', f"{stem}_{size_name}{extension}")
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            derivatives[f"{size_name}{suffix}"] = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return derivatives
+
+
+def delete_image_derivatives(derivatives):
+    """
+    Deletes the stored derivative files, e.g. when their upload is replaced or its instance deleted.
+    """
+    for name in (derivatives or {}).values():
+        if default_storage.exists(name):
+            default_storage.delete(name)
+
+
+def delete_stored_derivatives(instance, derivatives_field):
+    """
+    Deletes the derivative files of a replaced upload and clears them on the instance. The names are read from
+    the stored row, since the worker may have written them after the instance was loaded.
+    """
+    delete_image_derivatives(
+        type(instance)._default_manager.using(instance._state.db).filter(pk=instance.pk)
+        .values_list(derivatives_field, flat=True).first()
+    )
+    setattr(instance, derivatives_field, {})
+
+
+def derivative_urls(derivatives, request=None):
+    """
+    Returns the URLs of the ready derivatives, absolute when a request is given.
+    """
+    urls = {}
+    for size_name, name in (derivatives or {}).items():
+        url = default_storage.url(name)
+        urls[size_name] = request.build_absolute_uri(url) if request is not None else url
+    return urls
@@ -0,0 +1,104 @@
+import copy
+
+from django.db.models.fields.files import FieldFile
+
+
+class DirtyFieldsMixin:
+    """
+    Model mixin that snapshots the concrete field values as loaded from (or last written to) the database,
+    so that `save()` can tell which fields changed without re-reading the row.
+
+    Saving a loaded instance without explicit `update_fields` only writes the changed fields (plus `auto_now`
+    fields); new instances and instances without a snapshot are saved as usual.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_fields(field.name for field in cls._meta.concrete_fields if field.attname in field_names)
+        return instance
+
+    def tracked_value(self, field_name):
+        """
+        Returns the comparable current value of a field: the file name for file fields and a copy
+        for mutable JSON values.
+        """
+        field = self._meta.get_field(field_name)
+        value = getattr(self, field.attname)
+        if isinstance(value, FieldFile):
+            return value.name or None
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def snapshot_fields(self, field_names):
+        """
+        Records the current values of the given fields as their database state.
+        """
+        loaded_values = self.__dict__.setdefault('_loaded_values', {})
+        for field_name in field_names:
+            field_name = self._meta.get_field(field_name).name  # update_fields may use attnames
+            loaded_values[field_name] = self.tracked_value(field_name)
+
+    def has_snapshot(self, field_name=None):
+        """
+        Returns whether the database state of the field (or of any field) is known.
+        """
+        loaded_values = self.__dict__.get('_loaded_values')
+        if loaded_values is None:
+            return False
+        return field_name is None or field_name in loaded_values
+
+    def get_original_value(self, field_name, default=None):
+        """
+        Returns the value of the field as it was loaded from the database.
+        """
+        return self.__dict__.get('_loaded_values', {}).get(field_name, default)
+
+    def is_dirty(self, field_name):
+        """
+        Returns whether the field differs from its database state. Fields without a snapshot, e.g. on new
+        instances, and files that were assigned but not yet stored count as dirty.
+        """
+        if not self.has_snapshot(field_name):
+            return True
+        value = getattr(self, self._meta.get_field(field_name).attname)
+        if isinstance(value, FieldFile) and value and not value._committed:
+            return True
+        return self.tracked_value(field_name) != self.get_original_value(field_name)
+
+    def get_dirty_fields(self):
+        """
+        Returns the names of the fields that changed since they were loaded or saved, including
+        deferred fields that were assigned since.
+        """
+        return [
+            field_name for field_name in self.get_loaded_field_names()
+            if not self._meta.get_field(field_name).primary_key and self.is_dirty(field_name)
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the instance, limited to the changed and `auto_now` fields for loaded instances, and refreshes
+        the snapshot of the written fields.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not args and not kwargs.get('force_insert') and not self._state.adding \
+                and self.has_snapshot():
+            auto_now_fields = [
+                field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)
+            ]
+            update_fields = kwargs['update_fields'] = list(dict.fromkeys([*self.get_dirty_fields(), *auto_now_fields]))
+        super().save(*args, **kwargs)
+        self.snapshot_fields(update_fields if update_fields is not None else self.get_loaded_field_names())
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self.snapshot_fields(fields if fields is not None else self.get_loaded_field_names())
+
+    def get_loaded_field_names(self):
+        """
+        Returns the names of the concrete fields that are not deferred on this instance.
+        """
+        deferred = self.get_deferred_fields()
+        return [field.name for field in self._meta.concrete_fields if field.attname not in deferred]
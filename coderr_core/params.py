@@ -0,0 +1,21 @@
+# Largest primary key a 64-bit integer column can hold
+MAX_ID = 2 ** 63 - 1
+
+
+def parse_id_list(value, max_ids):
+    """
+    Parses a comma-separated list of ids from a query parameter, dropping duplicates and keeping the order.
+    Returns the ids and an error message or None; ids outside 1..`MAX_ID` are rejected before they reach
+    the database.
+    """
+    try:
+        ids = list(dict.fromkeys(int(pk) for pk in value.split(',') if pk.strip()))
+    except ValueError:
+        return [], "Ids must be a comma-separated list of integers."
+    if not ids:
+        return [], "At least one id is required."
+    if len(ids) > max_ids:
+        return [], f"At most {max_ids} ids can be requested at once."
+    if any(not 1 <= pk <= MAX_ID for pk in ids):
+        return [], f"Ids must be between 1 and {MAX_ID}."
+    return ids, None
@@ -109,6 +109,43 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'coderr',
+    }
+}
+
+# Lifetime in seconds of cached offer list and retrieve responses. Any offer change invalidates them earlier.
+OFFER_CACHE_TIMEOUT = 300
+
+# Number of offers inserted per transaction by the NDJSON offer import (endpoint and management command).
+OFFER_IMPORT_CHUNK_SIZE = 500
+
+# Number of offers (with their details) fetched per database round trip by the streaming offer export.
+OFFER_EXPORT_CHUNK_SIZE = 500
+
+# Offer views are counted in memory and written in batches every `OFFER_VIEW_COUNTER_FLUSH_INTERVAL` seconds
+# by the serving processes, or as soon as `OFFER_VIEW_COUNTER_MAX_PENDING` offers have buffered views.
+OFFER_VIEW_COUNTER_FLUSH_INTERVAL = 10
+OFFER_VIEW_COUNTER_MAX_PENDING = 10000
+
+# Days deleted offers are reported by the change feed; older cursors must resync (`prune_offer_tombstones`).
+OFFER_TOMBSTONE_RETENTION_DAYS = 30
+
+
+# Image derivatives of offer and profile uploads (requires Pillow), rendered after the commit by a bounded
+# thread pool. `IMAGE_PIPELINE_EAGER` renders them inline instead, e.g. for tests.
+
+IMAGE_DERIVATIVE_SIZES = {'thumbnail': (150, 150), 'card': (600, 400)}
+IMAGE_DERIVATIVES_WEBP = True
+IMAGE_PIPELINE_WORKERS = 2
+IMAGE_PIPELINE_EAGER = False
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_core.settings')
 
 application = get_wsgi_application()
+
+# Serving processes write the buffered offer view counts in the background and once more on exit
+from offers_app.counters import offer_view_counter  # noqa: E402
+
+offer_view_counter.start()
@@ -0,0 +1,65 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+
+def offer_validators(offer, prefix='offer', pk=None, variant=''):
+    """
+    Returns the strong `ETag` and the `Last-Modified` timestamp of a representation that only depends on
+    the given offer. `updated_at` is bumped on every offer and detail change, so it versions the whole offer.
+    `variant` distinguishes alternative representations of the same offer, e.g. sparse fieldsets.
+    """
+    etag = f"{prefix}-{pk or offer.pk}-{offer.updated_at.timestamp():.6f}"
+    if variant:
+        etag = f"{etag}-{variant}"
+    etag = quote_etag(etag)
+    return etag, int(offer.updated_at.timestamp())
+
+
+def combined_etag(validators):
+    """
+    Combines the (`ETag`, `Last-Modified`) pairs of several representations into the strong `ETag` of a response
+    that contains all of them, taken over the individual ETags in order. There is no combined `Last-Modified`:
+    the latest modification of the remaining representations does not change when one of them disappears.
+    """
+    digest = hashlib.sha256(' '.join(etag for etag, last_modified in validators).encode('utf-8')).hexdigest()
+    return quote_etag(f"batch-{digest[:32]}")
+
+
+def catalog_etag(cache_key):
+    """
+    Returns a weak `ETag` for a list page derived from its response cache key, which already contains
+    the catalog version and the hash of the request parameters.
+    """
+    version, digest = cache_key.rsplit(':', 2)[1:]
+    return 'W/' + quote_etag(f"catalog-{version}-{digest[:32]}")
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """
+    Adds the `ETag` and `Last-Modified` headers to the response.
+    """
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def get_validators(response):
+    """
+    Reads the validators back from the headers of a response, e.g. to store them alongside its cached data.
+    """
+    return {'etag': response.get('ETag'), 'last_modified': parse_http_date_safe(response.get('Last-Modified', ''))}
+
+
+def get_not_modified_response(request, etag=None, last_modified=None):
+    """
+    Evaluates the request's `If-None-Match` / `If-Modified-Since` (and `If-Match` / `If-Unmodified-Since`)
+    headers against the validators. Returns the 304 (or 412) response or None if the full response is needed.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
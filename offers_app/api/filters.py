@@ -1,6 +1,10 @@
 import django_filters
-from django.db.models import Min
-from ..models import Offer
+from django.db.models import Exists, F, OuterRef
+from rest_framework import filters
+
+from ..features import parse_feature_query
+from ..models import Offer, OfferFeature
+from ..search import build_match_query, search_index_available
 
 
 class OfferFilter(django_filters.FilterSet):
@@ -10,6 +14,7 @@ class OfferFilter(django_filters.FilterSet):
     min_price = django_filters.NumberFilter(method='filter_min_price', label="Mindestpreis")
     max_delivery_time = django_filters.NumberFilter(method='filter_max_delivery_time', label="Maximale Lieferzeit")
     creator_id = django_filters.NumberFilter(method='filter_creator_id', label="Ersteller-ID")
+    features = django_filters.CharFilter(method='filter_features', label="Features")
 
     class Meta:
         model = Offer
@@ -19,16 +24,53 @@ class OfferFilter(django_filters.FilterSet):
         """
         Filters the offers to only include those with a price greater than or equal to the specified minimum price.
         """
-        return queryset.annotate(min_price=Min('details__price')).filter(min_price__gte=value)
+        return queryset.filter(min_price__gte=value)
 
     def filter_max_delivery_time(self, queryset, name, value):
         """
-        Filters the offers to only include those with a maximum delivery time less than or equal to the specified value.
+        Filters the offers to only include those with at least one detail whose delivery time is less than or equal
+        to the specified value.
         """
-        return queryset.filter(details__delivery_time_in_days__lte=value).distinct()
+        return queryset.filter(min_delivery_time__lte=value)
 
     def filter_creator_id(self, queryset, name, value):
         """
         Filters the offers to only include those created by a specific user, identified by the `creator_id` (user ID).
         """
         return queryset.filter(user__id=value)
+
+    def filter_features(self, queryset, name, value):
+        """
+        Filters the offers by the features of their details using the feature index. Comma-separated groups
+        must all match, `|`-separated alternatives within a group are combined with OR,
+        e.g. `features=logo design|branding,responsive`.
+        """
+        for tokens in parse_feature_query(value):
+            queryset = queryset.filter(Exists(
+                OfferFeature.objects.filter(offer=OuterRef('pk'), token__in=tokens)
+            ))
+        return queryset
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    Serves the `search` parameter by joining the offer full-text index (SQLite FTS5) and annotates every match
+    with its relevance as `search_rank`. Falls back to the `icontains` lookups of `SearchFilter`
+    on databases without the index.
+    """
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        match = build_match_query(search_terms) if search_terms else None
+        if match is None or not search_index_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        return queryset.filter(search_index__document__match=match).annotate(search_rank=F('search_index__rank'))
+
+
+class OfferOrderingFilter(filters.OrderingFilter):
+    """
+    Ordering filter that orders full-text search results by relevance unless an explicit ordering is requested.
+    """
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and 'search_rank' in queryset.query.annotations:
+            return ['search_rank', 'id']
+        return super().get_ordering(request, queryset, view)
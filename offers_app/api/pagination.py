@@ -1,4 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class LargeResultsSetPagination(PageNumberPagination):
@@ -8,3 +18,141 @@ class LargeResultsSetPagination(PageNumberPagination):
     page_size = 6
     page_size_query_param = 'page_size'
     max_page_size = 50
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination keyed on the first ordering field of the queryset with the primary key as tiebreaker.
+    Each page is fetched with an index-friendly range predicate instead of COUNT and OFFSET, so the cost of a page
+    does not depend on how deep it is. The response only contains a `next` link and the `results`.
+    """
+    page_size = LargeResultsSetPagination.page_size
+    page_size_query_param = 'page_size'
+    max_page_size = LargeResultsSetPagination.max_page_size
+    cursor_query_param = 'cursor'
+    ordering_fields = []
+    default_ordering = None
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns the page of objects following the cursor position, ordered by the keyset.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        field_name = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+        self.model_field = queryset.model._meta.get_field(field_name)
+
+        tiebreaker = f"-{self.tiebreaker}" if descending else self.tiebreaker
+        queryset = queryset.order_by(self.ordering, tiebreaker)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(queryset, field_name, descending, *position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        """
+        Returns the requested page size, bounded by `max_page_size`.
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """
+        Returns the keyset ordering taken from the first ordering of the queryset if it is supported,
+        otherwise the default ordering.
+        """
+        if queryset.query.order_by:
+            ordering = queryset.query.order_by[0]
+            if isinstance(ordering, str) and ordering.lstrip('-') in self.ordering_fields:
+                return ordering
+        return self.default_ordering
+
+    def get_position_filter(self, queryset, field_name, descending, value, pk):
+        """
+        Builds the predicate selecting all rows after the given (value, pk) position. NULL values are placed
+        where the database sorts them, so the predicate matches the native ORDER BY and can use its index.
+        """
+        after = 'lt' if descending else 'gt'
+        nulls_largest = connections[queryset.db].features.nulls_order_largest
+        nulls_last = nulls_largest != descending
+        if value is None:
+            position = Q(**{f"{field_name}__isnull": True, f"{self.tiebreaker}__{after}": pk})
+            if not nulls_last:
+                position |= Q(**{f"{field_name}__isnull": False})
+            return position
+        position = Q(**{f"{field_name}__{after}": value}) | Q(**{field_name: value, f"{self.tiebreaker}__{after}": pk})
+        if nulls_last and self.model_field.null:
+            position |= Q(**{f"{field_name}__isnull": True})
+        return position
+
+    def decode_cursor(self, request):
+        """
+        Decodes the cursor query parameter into a (value, pk) position or returns None for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if data['o'] != self.ordering:
+                raise ValueError('Cursor belongs to a different ordering.')
+            value = None if data['v'] is None else self.model_field.to_python(data['v'])
+            return value, int(data['pk'])
+        except (binascii.Error, UnicodeError, TypeError, KeyError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance):
+        """
+        Encodes the position of the given instance together with the current ordering.
+        """
+        value = getattr(instance, self.model_field.attname)
+        if value is not None:
+            value = self.model_field.value_to_string(instance)
+        data = {'o': self.ordering, 'v': value, 'pk': getattr(instance, self.tiebreaker)}
+        return base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+
+    def get_next_link(self):
+        """
+        Returns the URL of the next page or None on the last page.
+        """
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class OfferKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination for the offer list, keyed on `updated_at`, `min_price` or `views` with `id` as tiebreaker.
+    """
+    ordering_fields = ['updated_at', 'min_price', 'views']
+    default_ordering = 'updated_at'
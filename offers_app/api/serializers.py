@@ -1,9 +1,73 @@
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from ..models import Offer, OfferDetail
+from ..signals import offer_details_bulk_changed
+from ..search import batched_indexing
 from rest_framework.reverse import reverse
-from django.db.models import Min
+from coderr_core.images import derivative_urls
 import os
 
+# Id used to resolve the offer detail URL once; the URL is split around it and the real ids are formatted in
+DETAIL_URL_PLACEHOLDER = 987654321
+
+
+def get_query_param_set(request, param):
+    """
+    Returns the comma-separated names of a query parameter as a set, or None if the parameter is not given.
+    Accepts DRF requests as well as plain Django requests.
+    """
+    query_params = getattr(request, 'query_params', getattr(request, 'GET', {}))
+    if param not in query_params:
+        return None
+    return {name.strip() for value in query_params.getlist(param) for name in value.split(',') if name.strip()}
+
+
+def get_requested_fields(request):
+    """
+    Returns the field names selected with `?fields=`, or None if all fields are requested.
+    """
+    return get_query_param_set(request, 'fields')
+
+
+def get_expanded_fields(request):
+    """
+    Returns the field names selected with `?expand=`.
+    """
+    return get_query_param_set(request, 'expand') or set()
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for the `fields` and `expand` query parameters of the top-level serializer.
+    `?fields=id,title` renders only the listed fields, so the method fields of unrequested data are never
+    called; unknown names are ignored. `?expand=details` replaces fields with the richer representations
+    listed in `expandable_fields`.
+    """
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.is_top_level():
+            return fields
+        request = self.context.get('request')
+        for field_name in get_expanded_fields(request) & self.expandable_fields.keys():
+            fields[field_name] = self.expandable_fields[field_name]()
+        requested_fields = get_requested_fields(request)
+        if requested_fields is not None:
+            fields = {field_name: field for field_name, field in fields.items() if field_name in requested_fields}
+        return fields
+
+    def is_top_level(self):
+        """
+        Returns whether the serializer renders the response itself or the items of a top-level list,
+        as opposed to being nested in another serializer.
+        """
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
 
 class OfferDetailSerializer(serializers.ModelSerializer):
     """
@@ -69,8 +133,18 @@ class OfferCreateSerializer(serializers.ModelSerializer):
             OfferDetail.objects.bulk_create([
                 OfferDetail(offer=offer, **detail) for detail in details_data
             ])
+            offer_details_bulk_changed.send(sender=Offer, offer_ids=[offer.id], using=offer._state.db)
         return offer
 
+    def validate_details(self, value):
+        """
+        Ensure that every offer_type is used at most once per offer, as required by the unique constraint.
+        """
+        offer_types = [detail['offer_type'] for detail in value]
+        if len(offer_types) != len(set(offer_types)):
+            raise serializers.ValidationError("Each offer_type may only be used once per offer.")
+        return value
+
     def validate_image(self, value):
         """
         Validates that the uploaded image has an allowed extension (.jpg, .jpeg, .png).
@@ -105,85 +179,132 @@ class OfferUpdateSerializer(serializers.ModelSerializer):   # PUT / PATCH
         return value
 
     def validate_details(self, value):
-        """Ensure that the details reference valid OfferDetail instances."""
-        offer_id = self.instance.id if self.instance else None
+        """
+        Ensure that the details reference valid OfferDetail instances. All details of the offer are loaded
+        with a single query and checked in memory.
+        """
+        existing_details = self.get_existing_details()
+        seen_offer_types = set()
         for detail in value:
             detail_offer_type = detail.get('offer_type')
             if detail_offer_type:
-                if not OfferDetail.objects.filter(offer=offer_id, offer_type=detail_offer_type).exists():
+                if detail_offer_type not in existing_details:
                     raise serializers.ValidationError({"details": "OfferDetail does not exist."})
+                if detail_offer_type in seen_offer_types:
+                    raise serializers.ValidationError({"details": "Each offer_type may only be used once per offer."})
+                seen_offer_types.add(detail_offer_type)
             else:
                 raise serializers.ValidationError({"details": "Offer_type for OfferDetail must be provided."})
         return value
 
+    def get_existing_details(self):
+        """
+        Returns the details of the offer being updated keyed by `offer_type`, loading them once per serializer.
+        """
+        if getattr(self, '_existing_details', None) is None:
+            self._details_queryset = self.instance.details.all() if self.instance else OfferDetail.objects.none()
+            self._existing_details = {detail.offer_type: detail for detail in self._details_queryset}
+        return self._existing_details
+
     def update(self, instance, validated_data):
         """
-        Updates an existing `Offer` instance and its associated `OfferDetail` instances.
+        Updates an existing `Offer` instance and its associated `OfferDetail` instances in one transaction.
+        The changed details are validated in memory and written with a single `bulk_update`.
         """
         details_data = validated_data.pop('details', None)
         image = validated_data.pop('image', None)
-        instance = super().update(instance, validated_data)
-
         if image:
-            instance.image = image
-            instance.save()
+            validated_data['image'] = image
 
-        if details_data:
-            for detail_data in details_data:
-                detail_offer_type = detail_data.get('offer_type', None)
-                if detail_offer_type:
-                    try:
-                        detail_instance = OfferDetail.objects.get(offer=instance, offer_type=detail_offer_type)
-                        detail_instance.title = detail_data.get('title')
-                        detail_instance.revisions = detail_data.get('revisions')
-                        detail_instance.delivery_time_in_days = detail_data.get('delivery_time_in_days')
-                        detail_instance.price = detail_data.get('price')
-                        detail_instance.features = detail_data.get('features')
-                        detail_instance.save()
-                    except OfferDetail.DoesNotExist:
-                        raise serializers.ValidationError({"details": "OfferDetail does not exist."})
-                else:
-                    raise serializers.ValidationError({"details": "Offer_type for OfferDetail must be provided."})
+        # The offer and its details are reindexed for search once, after both are written
+        with transaction.atomic(), batched_indexing():
+            instance = super().update(instance, validated_data)
+            if details_data:
+                self.update_details(instance, details_data)
         return instance
 
-
-class OfferDetailViewSerializer(serializers.ModelSerializer):   # GET Retrieve
+    def update_details(self, instance, details_data):
+        """
+        Applies the submitted fields to the loaded details, validates them and writes all changes with one query.
+        The updated details are attached to the instance so the response is rendered without re-querying.
+        """
+        existing_details = self.get_existing_details()
+        changed_details = []
+        changed_fields = set()
+        for detail_data in details_data:
+            detail_instance = existing_details.get(detail_data.get('offer_type'))
+            if detail_instance is None:
+                raise serializers.ValidationError({"details": "OfferDetail does not exist."})
+            for field, value in detail_data.items():
+                setattr(detail_instance, field, value)
+                changed_fields.add(field)
+            try:
+                detail_instance.full_clean(exclude=['offer'])
+            except DjangoValidationError as error:
+                raise serializers.ValidationError({"details": error.message_dict})
+            changed_details.append(detail_instance)
+
+        changed_fields.discard('offer_type')
+        if changed_details and changed_fields:
+            OfferDetail.objects.bulk_update(changed_details, sorted(changed_fields))
+            offer_details_bulk_changed.send(
+                sender=Offer, offer_ids=[instance.pk], using=instance._state.db, fields=sorted(changed_fields)
+            )
+        instance.__dict__.setdefault('_prefetched_objects_cache', {})['details'] = self._details_queryset
+
+
+class OfferDetailViewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):   # GET Retrieve
     """
     Serializer for representing an `Offer` with its related `OfferDetail` instances for the "retrieve" action.
-    Includes additional fields for the minimum price and minimum delivery time across all `OfferDetail` instances.
+    Includes the minimum price and minimum delivery time across all `OfferDetail` instances, read from the
+    denormalized columns on `Offer`. Supports `?fields=` and `?expand=details` for the full detail objects.
     """
     details = serializers.SerializerMethodField()
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    image_derivatives = serializers.SerializerMethodField()
+    expandable_fields = {
+        'details': lambda: OfferDetailSerializer(many=True, read_only=True),
+    }
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time']
+        fields = ['id', 'user', 'title', 'image', 'image_derivatives', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time']
 
     def get_details(self, obj):
         """
         Retrieves the related `OfferDetail` instances for the offer and returns their URLs.
+        Uses the prefetched details when the queryset provides them. The URLs are formatted from
+        the parts resolved once per serialization instead of reversing every detail URL.
         """
-        request = self.context.get('request')
+        prefix, suffix = self.get_detail_url_parts()
         return [
             {
                 "id": detail.id,
-                "url": request.build_absolute_uri(reverse("offerdetails-detail", args=[detail.id]))
+                "url": f"{prefix}{detail.id}{suffix}"
             }
             for detail in obj.details.all()
         ]
 
-    def get_min_price(self, obj):
+    def get_detail_url_parts(self):
         """
-        Retrieves the minimum price from the related `OfferDetail` instances.
+        Returns the absolute offer detail URL split around the id. It is resolved on first use and kept
+        on the root serializer, so a whole list page shares one `reverse` and `build_absolute_uri` call.
         """
-        return obj.details.aggregate(Min("price"))["price__min"]
-
-    def get_min_delivery_time(self, obj):
+        root = self.root
+        url_parts = getattr(root, '_detail_url_parts', None)
+        if url_parts is None:
+            url = reverse("offerdetails-detail", args=[DETAIL_URL_PLACEHOLDER])
+            request = self.context.get('request')
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            prefix, _, suffix = url.rpartition(str(DETAIL_URL_PLACEHOLDER))
+            url_parts = root._detail_url_parts = (prefix, suffix)
+        return url_parts
+
+    def get_image_derivatives(self, obj):
         """
-        Retrieves the minimum delivery time from the related `OfferDetail` instances.
+        Returns the URLs of the thumbnail and card-size renditions of the image once they are ready.
         """
-        return obj.details.aggregate(Min("delivery_time_in_days"))["delivery_time_in_days__min"]
+        return derivative_urls(obj.image_derivatives, self.context.get('request'))
 
 
 class OfferListSerializer(OfferDetailViewSerializer):  # GET List
@@ -195,12 +316,15 @@ class OfferListSerializer(OfferDetailViewSerializer):  # GET List
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
+        fields = ['id', 'user', 'title', 'image', 'image_derivatives', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
         extra_kwargs = {
             'user': {'read_only': True},
         }
 
     def get_user_details(self, obj):
+        """
+        Returns the name fields of the offer owner, which the list queryset joins via `select_related`.
+        """
         return {
             "first_name": obj.user.first_name,
             "last_name": obj.user.last_name,
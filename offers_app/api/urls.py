@@ -1,5 +1,5 @@
 from django.urls import path, include
-from .views import OfferDetailDetailView, OfferViewSet
+from .views import OfferDetailBatchView, OfferDetailDetailView, OfferViewSet
 from rest_framework.routers import DefaultRouter
 
 
@@ -8,5 +8,6 @@ router.register(r'offers', OfferViewSet, basename='offer')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('offerdetails/', OfferDetailBatchView.as_view(), name='offerdetails-list'),
     path('offerdetails/<int:pk>/', OfferDetailDetailView.as_view(), name='offerdetails-detail'),
 ]
@@ -1,14 +1,29 @@
-from rest_framework import viewsets, generics
+import hashlib
+from functools import partial
+
+from rest_framework import serializers, viewsets, generics
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from ..models import Offer, OfferDetail
 from .serializers import OfferUpdateSerializer, OfferDetailSerializer, OfferListSerializer, OfferDetailViewSerializer, OfferCreateSerializer
+from .serializers import get_expanded_fields, get_requested_fields
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework import filters
 from django_filters.rest_framework import DjangoFilterBackend
-from .pagination import LargeResultsSetPagination
-from .filters import OfferFilter
-from django.db.models import Min, Max
+from .pagination import LargeResultsSetPagination, OfferKeysetPagination
+from .filters import OfferFilter, OfferSearchFilter, OfferOrderingFilter
 from .permissions import IsOwnerOrAdminOrReadOnly
+from ..importers import OfferImporter
+from ..exporters import OfferExporter
+from ..counters import offer_view_counter
+from ..changes import DELETE, InvalidCursor, decode_cursor, encode_cursor, get_changes, is_expired
+from ..features import autocomplete_features
+from .conditional import catalog_etag, combined_etag, get_not_modified_response, get_validators, offer_validators, set_validators
+from ..cache import get_cache_stats, get_cache_timeout, record_cache_access, response_cache_key
+from django.core.cache import cache
+from coderr_core.params import parse_id_list
 
 
 class OfferViewSet(viewsets.ModelViewSet):
@@ -17,27 +32,89 @@ class OfferViewSet(viewsets.ModelViewSet):
     ordering, and pagination of offers, while ensuring proper permissions are enforced.
     """
     filterset_class = OfferFilter
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter, OfferOrderingFilter]
     search_fields = ['title', 'description']
-    ordering_fields = ['updated_at', 'min_price']
+    ordering_fields = ['updated_at', 'min_price', 'views']
     ordering = ['updated_at']
     pagination_class = LargeResultsSetPagination
+    keyset_pagination_class = OfferKeysetPagination
+    facet_price_edges = [0, 50, 100, 250, 500, 1000]
+    facet_delivery_time_edges = [1, 3, 7, 14, 30]
+    feature_autocomplete_limit = 10
+    feature_autocomplete_max_limit = 50
+    fieldset_params = ['fields', 'expand']
+    changes_page_size = 100
+    changes_max_page_size = 500
+    # Offer columns read by serializer fields whose name is not a column
+    fieldset_columns = {'user_details': ['user'], 'details': []}
     queryset = Offer.objects.all()
     serializer_class = OfferListSerializer
     permission_classes = [IsOwnerOrAdminOrReadOnly]
 
+    @property
+    def paginator(self):
+        """
+        Returns the page-number paginator by default and the keyset paginator when the request
+        opts in with `?pagination=cursor`.
+        """
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
         """
-        Returns the filtered and annotated queryset for listing objects.
-        Annotates the queryset with the minimum price and maximum delivery time.
-        Applies filtering, searching, and ordering only for GET requests in the 'list' action.
+        Returns the queryset for the current action. Price and delivery time are read from the denormalized
+        columns on `Offer`; the list additionally uses the query-budgeted list queryset.
         """
-        queryset = super().get_queryset().annotate(min_price=Min("details__price"), max_delivery_time=Max("details__delivery_time_in_days"))
+        queryset = super().get_queryset()
         if self.request.method == "GET" and self.action == 'list':
-            filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-            for backend in filter_backends:
-                queryset = backend().filter_queryset(self.request, queryset, self)
+            queryset = self.get_list_queryset(queryset)
         return queryset
 
+    def filter_queryset(self, queryset):
+        """
+        Applies filtering, searching, and ordering once, and only for the list, its facets and the export.
+        Single-object actions are looked up by id alone.
+        """
+        if self.action not in ('list', 'facets', 'export'):
+            return queryset
+        return super().filter_queryset(queryset)
+
+    def get_list_queryset(self, queryset):
+        """
+        Joins the offer owner and prefetches the detail ids so that a whole page is serialized
+        by `OfferListSerializer` without any per-offer queries. With `?fields=` only the requested columns
+        are loaded and the join and prefetch are skipped unless their fields are requested;
+        `?expand=details` prefetches the complete details.
+        """
+        requested_fields = get_requested_fields(self.request)
+        if requested_fields is None or 'user_details' in requested_fields:
+            queryset = queryset.select_related('user')
+        if requested_fields is None or 'details' in requested_fields:
+            details = OfferDetail.objects.order_by('id')
+            if 'details' not in get_expanded_fields(self.request):
+                details = details.only('id', 'offer_id')
+            queryset = queryset.prefetch_related(Prefetch('details', queryset=details))
+        if requested_fields is not None:
+            queryset = queryset.only(*self.get_fieldset_columns(requested_fields))
+        return queryset
+
+    def get_fieldset_columns(self, requested_fields):
+        """
+        Returns the offer columns needed to render the requested fields, plus the keyset pagination columns
+        and `created_at` read by the change feed, so that no deferred field is loaded per offer.
+        """
+        concrete_fields = {field.name for field in Offer._meta.concrete_fields}
+        columns = {'id', 'created_at', *self.keyset_pagination_class.ordering_fields}
+        for field_name in requested_fields:
+            columns.update(
+                column for column in self.fieldset_columns.get(field_name, [field_name]) if column in concrete_fields
+            )
+        return sorted(columns)
+
     def get_serializer_class(self):
         """
         Returns the appropriate serializer class based on the action being performed.
@@ -50,6 +127,204 @@ class OfferViewSet(viewsets.ModelViewSet):
             return OfferCreateSerializer  # POST /offers/
         return OfferUpdateSerializer  # PUT, PATCH  /offers/{id}/
 
+    def get_list_cache_params(self):
+        """
+        Returns the query parameters that influence the list response and therefore make up its cache key.
+        """
+        paginator = self.paginator
+        return {
+            *self.filterset_class.base_filters, OfferSearchFilter.search_param, OfferOrderingFilter.ordering_param,
+            'page', 'page_size', 'pagination', getattr(paginator, 'cursor_query_param', 'cursor'), *self.fieldset_params,
+        }
+
+    def get_cached_response(self, cache_key, build_response):
+        """
+        Returns the cached response data for the key or builds the response and caches its data and validators
+        if it succeeded. A cache hit is answered with 304 when the request's conditional headers still match.
+        Marks the response with an `X-Cache` header and counts the hit or miss.
+        """
+        entry = cache.get(cache_key)
+        if entry is not None:
+            record_cache_access(hit=True)
+            response = get_not_modified_response(self.request, **entry['validators'])
+            if response is None:
+                response = set_validators(Response(entry['data']), **entry['validators'])
+            response['X-Cache'] = 'HIT'
+            return response
+        record_cache_access(hit=False)
+        response = build_response()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, {'data': response.data, 'validators': get_validators(response)}, get_cache_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns the offer list from the response cache, keyed by the catalog version and the normalized filter,
+        search, ordering and pagination parameters. Builds and caches the page on a miss.
+        Pages carry a weak `ETag` derived from the same key, so `If-None-Match` is answered with 304
+        before the cache or the database is touched.
+        """
+        cache_key = response_cache_key('list', request, self.get_list_cache_params())
+        etag = catalog_etag(cache_key)
+        not_modified = get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = self.get_cached_response(cache_key, partial(super().list, request, *args, **kwargs))
+        return set_validators(response, etag=etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns a single offer from the response cache, keyed by the catalog version, the offer id
+        and the requested fieldset. Every successful retrieve, including cache hits and 304 responses,
+        counts as a view in the buffered view counter.
+        """
+        cache_key = response_cache_key(f"retrieve:{kwargs[self.lookup_field]}", request, self.fieldset_params)
+        response = self.get_cached_response(cache_key, partial(self.get_retrieve_response, request))
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            offer_view_counter.increment(int(kwargs[self.lookup_field]))
+        return response
+
+    def get_retrieve_response(self, request):
+        """
+        Loads the offer and returns it with a strong `ETag` and `Last-Modified` header, or a 304 response
+        without serializing it when the request's conditional headers match.
+        """
+        instance = self.get_object()
+        etag, last_modified = offer_validators(instance, variant=self.get_fieldset_variant())
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+    def get_fieldset_variant(self):
+        """
+        Returns a short hash of the normalized `fields` and `expand` parameters, or an empty string for the full
+        representation. Different fieldsets of the same offer must not share an `ETag`.
+        """
+        requested_fields = get_requested_fields(self.request)
+        expanded_fields = get_expanded_fields(self.request)
+        if requested_fields is None and not expanded_fields:
+            return ''
+        fieldset = f"fields={','.join(sorted(requested_fields or ['*']))};expand={','.join(sorted(expanded_fields))}"
+        return hashlib.sha256(fieldset.encode('utf-8')).hexdigest()[:12]
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Returns the number of offers per minimum price bucket, delivery time bucket and offer type for the
+        filter sidebar. Takes the same filter and search parameters as the list and counts with a single
+        aggregate query; responses are cached and validated like list pages.
+        """
+        cache_key = response_cache_key('facets', request, [*self.filterset_class.base_filters, OfferSearchFilter.search_param])
+        etag = catalog_etag(cache_key)
+        not_modified = get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = self.get_cached_response(cache_key, partial(self.get_facets_response, request))
+        return set_validators(response, etag=etag)
+
+    def get_facets_response(self, request):
+        """
+        Filters the offers like the list does (without pagination) and counts their facets.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(queryset.facets(self.facet_price_edges, self.facet_delivery_time_edges))
+
+    @action(detail=False, methods=['get'], url_path='features')
+    def feature_autocomplete(self, request):
+        """
+        Suggests feature names starting with `q` from the feature index, most offered first, together with the
+        number of offers providing them. `limit` caps the suggestions (default 10, at most 50).
+        Responses are cached and validated like list pages.
+        """
+        cache_key = response_cache_key('features', request, ['q', 'limit'])
+        etag = catalog_etag(cache_key)
+        not_modified = get_not_modified_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = self.get_cached_response(cache_key, partial(self.get_feature_autocomplete_response, request))
+        return set_validators(response, etag=etag)
+
+    def get_feature_autocomplete_response(self, request):
+        """
+        Validates the `limit` parameter and returns the matching features.
+        """
+        limit = request.query_params.get('limit', self.feature_autocomplete_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return Response({"limit": "A valid integer is required."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.feature_autocomplete_max_limit))
+        return Response(autocomplete_features(request.query_params.get('q', ''), limit))
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Delta-sync feed: returns the offers created, updated and deleted after the `since` cursor in the order
+        they changed, with the payload of the list (honouring `fields` / `expand`) for created and updated offers.
+        `next` is the cursor to pass as `since` on the next call; `has_more` tells whether to continue right away.
+        Without `since` the feed starts at the beginning, i.e. a full sync. A cursor older than the retention
+        of deletions gets 410 and requires a full resync.
+        """
+        since = request.query_params.get('since')
+        try:
+            position = decode_cursor(since) if since else None
+        except InvalidCursor:
+            return Response({"since": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        if is_expired(position):
+            return Response(
+                {"detail": "The cursor is older than the retained deletions, a full resync is required."},
+                status=status.HTTP_410_GONE,
+            )
+
+        limit = self.get_changes_page_size(request)
+        changes, has_more = get_changes(position, limit, self.get_list_queryset(Offer.objects.all()))
+        offers = [offer for changed_at, kind, offer_id, offer in changes if offer is not None]
+        payloads = iter(OfferListSerializer(offers, many=True, context=self.get_serializer_context()).data)
+        changed_at_field = serializers.DateTimeField()
+        return Response({
+            'changes': [
+                {
+                    'type': self.get_change_type(kind, offer, position),
+                    'id': offer_id,
+                    'changed_at': changed_at_field.to_representation(changed_at),
+                    'offer': None if kind == DELETE else next(payloads),
+                }
+                for changed_at, kind, offer_id, offer in changes
+            ],
+            'next': encode_cursor(changes[-1][:3]) if changes else since,
+            'has_more': has_more,
+        })
+
+    def get_changes_page_size(self, request):
+        """
+        Returns the requested number of changes (`limit`), bounded by `changes_max_page_size`.
+        """
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            return self.changes_page_size
+        return max(1, min(limit, self.changes_max_page_size))
+
+    def get_change_type(self, kind, offer, position):
+        """
+        Classifies a change as deleted, created (after the cursor position) or updated.
+        """
+        if kind == DELETE:
+            return 'deleted'
+        if position is None or offer.created_at > position[0]:
+            return 'created'
+        return 'updated'
+
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+        Returns the hit and miss counters of the offer response cache (admin users only).
+        """
+        return Response(get_cache_stats())
+
     def create(self, request, *args, **kwargs):
         """
         Creates a new offer associated with the authenticated user.
@@ -61,6 +336,37 @@ class OfferViewSet(viewsets.ModelViewSet):
         response_serializer = OfferCreateSerializer(offer, context={"request": request})
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def export(self, request):
+        """
+        Streams the whole filtered catalog as NDJSON (default) or CSV, selected with `?output=ndjson|csv`.
+        Takes the list's filter, search and ordering parameters but is neither paginated nor cached; offers are
+        read in chunks and written line by line, so memory stays constant for any catalog size.
+        """
+        output_format = request.query_params.get('output', 'ndjson')
+        if output_format not in OfferExporter.formats:
+            return Response(
+                {"output": f"Supported formats are {', '.join(OfferExporter.formats)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        exporter = OfferExporter(queryset, output_format, request=request)
+        response = StreamingHttpResponse(exporter.stream(), content_type=exporter.content_type)
+        response['Content-Disposition'] = f'attachment; filename="offers.{output_format}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """
+        Imports offers for the authenticated business user from an NDJSON request body (one offer per line).
+        The body is read line by line and inserted in chunks; invalid lines are reported in the response.
+        """
+        if request.stream is None:
+            return Response({"detail": "The request body must contain NDJSON lines."}, status=status.HTTP_400_BAD_REQUEST)
+        summary = OfferImporter(request.user).run(request.stream)
+        response_status = status.HTTP_201_CREATED if summary['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(summary, status=response_status)
+
     def update(self, request, *args, **kwargs):
         """
         Updates an existing offer. Supports both full and partial updates, depending on the 
@@ -89,5 +395,50 @@ class OfferDetailDetailView(generics.RetrieveAPIView):
     A view that provides the functionality to retrieve the details of an individual offer detail.
     This view serves as a read-only endpoint for accessing the `OfferDetail` model.
     """
-    queryset = OfferDetail.objects.all()
+    queryset = OfferDetail.objects.select_related('offer')
     serializer_class = OfferDetailSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns the offer detail with a strong `ETag` and `Last-Modified` header taken from its offer,
+        whose `updated_at` is bumped on every detail change. Matching conditional requests get a 304
+        without running the serializer.
+        """
+        instance = self.get_object()
+        etag, last_modified = offer_validators(instance.offer, prefix='offerdetail', pk=instance.pk)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+
+class OfferDetailBatchView(generics.GenericAPIView):
+    """
+    Returns several offer details in one request, e.g. all packages of an offer page:
+    `GET /api/offerdetails/?ids=1,2,3`. The details are loaded with a single query and rendered with
+    `OfferDetailSerializer` in the requested order; unknown ids are left out.
+    """
+    queryset = OfferDetail.objects.select_related('offer')
+    serializer_class = OfferDetailSerializer
+    max_ids = 50
+
+    def get(self, request, *args, **kwargs):
+        """
+        Validates the id list and returns the details with an `ETag` combined from the validators of the
+        individual details, so unchanged batches are answered with 304. The ETag also changes when a requested
+        detail disappears, which is why no `Last-Modified` header is sent.
+        """
+        ids, error = parse_id_list(request.query_params.get('ids', ''), self.max_ids)
+        if error:
+            return Response({"ids": error}, status=status.HTTP_400_BAD_REQUEST)
+        details = self.get_queryset().in_bulk(ids)
+        details = [details[pk] for pk in ids if pk in details]
+        etag = combined_etag([
+            offer_validators(detail.offer, prefix='offerdetail', pk=detail.pk) for detail in details
+        ])
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(details, many=True)
+        return set_validators(Response(serializer.data), etag)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class OffersAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'offers_app'
+
+    def ready(self):
+        """
+        Connects the signal receivers that keep the offer full-text index, the feature index, the deletion
+        tombstones of the change feed and the response cache in sync.
+        """
+        from . import cache, changes, features, search  # noqa: F401
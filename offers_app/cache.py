@@ -0,0 +1,116 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coderr_core.images import image_derivatives_ready
+from .models import Offer, OfferDetail
+from .signals import offer_details_bulk_changed
+
+CATALOG_VERSION_KEY = 'offers:catalog-version'
+CACHE_HITS_KEY = 'offers:response-cache:hits'
+CACHE_MISSES_KEY = 'offers:response-cache:misses'
+
+
+def get_cache_timeout():
+    """
+    Returns the lifetime of cached offer responses in seconds (`OFFER_CACHE_TIMEOUT`, default 300).
+    """
+    return getattr(settings, 'OFFER_CACHE_TIMEOUT', 300)
+
+
+def get_catalog_version():
+    """
+    Returns the current catalog version. A missing (e.g. evicted) counter is restarted from the current time,
+    so it never falls back to a version whose cached responses may still exist.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """
+    Increments the catalog version, which invalidates all cached offer responses at once.
+    """
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        return cache.get(CATALOG_VERSION_KEY)
+
+
+def response_cache_key(kind, request, params=(), version=None):
+    """
+    Builds the cache key of an offer response from the catalog version, the host (responses contain absolute URLs)
+    and the normalized values of the given query parameters. Other query parameters are ignored.
+    """
+    if version is None:
+        version = get_catalog_version()
+    normalized = '&'.join(
+        f"{param}={value}"
+        for param in sorted(params)
+        for value in sorted(request.query_params.getlist(param))
+    )
+    digest = hashlib.sha256(f"{request.build_absolute_uri('/')}?{normalized}".encode('utf-8')).hexdigest()
+    return f"offers:{kind}:{version}:{digest}"
+
+
+def record_cache_access(hit):
+    """
+    Increments the hit or miss counter of the offer response cache.
+    """
+    key = CACHE_HITS_KEY if hit else CACHE_MISSES_KEY
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+
+def get_cache_stats():
+    """
+    Returns the hit and miss counters of the offer response cache together with the current catalog version.
+    """
+    hits = cache.get(CACHE_HITS_KEY, 0)
+    misses = cache.get(CACHE_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+        'catalog_version': get_catalog_version(),
+    }
+
+
+def reset_cache_stats():
+    """
+    Resets the hit and miss counters of the offer response cache.
+    """
+    cache.delete_many([CACHE_HITS_KEY, CACHE_MISSES_KEY])
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_responses(sender, **kwargs):
+    """
+    Bumps the catalog version whenever an offer or offer detail is saved or deleted.
+    """
+    bump_catalog_version()
+
+
+@receiver(offer_details_bulk_changed)
+@receiver(image_derivatives_ready, sender=Offer)
+def invalidate_offer_responses_after_bulk_change(sender, **kwargs):
+    """
+    Bumps the catalog version after OfferDetail rows were written in bulk or the image derivatives
+    of an offer were stored, both of which bypass the model signals.
+    """
+    bump_catalog_version()
@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Offer, OfferTombstone
+
+# Order of the change kinds at the same timestamp, part of the feed position
+UPSERT, DELETE = 0, 1
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised for a change feed cursor that cannot be decoded.
+    """
+
+
+def get_tombstone_retention():
+    """
+    Returns how long deletions are kept for the change feed (`OFFER_TOMBSTONE_RETENTION_DAYS`, default 30).
+    """
+    return timedelta(days=getattr(settings, 'OFFER_TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def encode_cursor(position):
+    """
+    Encodes a (timestamp, kind, offer id) feed position as an opaque URL-safe cursor.
+    """
+    changed_at, kind, offer_id = position
+    data = {'t': changed_at.isoformat(), 'k': kind, 'pk': offer_id}
+    return base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor into its (timestamp, kind, offer id) feed position.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        changed_at = parse_datetime(data['t'])
+        if changed_at is None or timezone.is_naive(changed_at) or data['k'] not in (UPSERT, DELETE):
+            raise ValueError('Invalid position.')
+        return changed_at, data['k'], int(data['pk'])
+    except (binascii.Error, UnicodeError, TypeError, KeyError, ValueError) as error:
+        raise InvalidCursor(str(error))
+
+
+def after_position(time_field, id_field, kind, position):
+    """
+    Builds the predicate selecting the rows of one change kind that come after the feed position
+    in (timestamp, kind, id) order. It is a range on the (timestamp, id) index of the kind's table.
+    """
+    changed_at, position_kind, offer_id = position
+    if kind < position_kind:
+        return Q(**{f'{time_field}__gt': changed_at})
+    if kind > position_kind:
+        return Q(**{f'{time_field}__gte': changed_at})
+    return Q(**{f'{time_field}__gt': changed_at}) | Q(**{time_field: changed_at, f'{id_field}__gt': offer_id})
+
+
+def get_changes(position=None, limit=100, offers=None):
+    """
+    Returns up to `limit` changes after the feed position, ordered by time, and whether more changes follow.
+    Each change is a (timestamp, kind, offer id, offer or None) tuple. Both sources are read with one range
+    query each on their (timestamp, id) index, so a sync costs O(changes) rather than O(catalog).
+    `offers` is the queryset used for created and updated offers, e.g. with the payload's prefetches.
+    """
+    offers = Offer.objects.all() if offers is None else offers
+    tombstones = OfferTombstone.objects.all()
+    if position is not None:
+        offers = offers.filter(after_position('updated_at', 'id', UPSERT, position))
+        tombstones = tombstones.filter(after_position('deleted_at', 'offer_id', DELETE, position))
+    changes = [
+        (offer.updated_at, UPSERT, offer.pk, offer)
+        for offer in offers.order_by('updated_at', 'id')[:limit + 1]
+    ] + [
+        (tombstone.deleted_at, DELETE, tombstone.offer_id, None)
+        for tombstone in tombstones.order_by('deleted_at', 'offer_id')[:limit + 1]
+    ]
+    changes.sort(key=lambda change: change[:3])
+    return changes[:limit], len(changes) > limit
+
+
+def is_expired(position):
+    """
+    Returns whether the position is older than the tombstone retention, so deletions since may be missing.
+    """
+    return position is not None and position[0] < timezone.now() - get_tombstone_retention()
+
+
+def prune_tombstones(before=None):
+    """
+    Deletes the tombstones older than the retention (or `before`) and returns their number.
+    """
+    before = before or timezone.now() - get_tombstone_retention()
+    deleted, _ = OfferTombstone.objects.filter(deleted_at__lt=before).delete()
+    return deleted
+
+
+@receiver(post_delete, sender=Offer)
+def record_offer_tombstone(sender, instance, using, **kwargs):
+    """
+    Records the deletion of an offer for the change feed.
+    """
+    OfferTombstone.objects.using(using).update_or_create(offer_id=instance.pk, defaults={'deleted_at': timezone.now()})
+
@@ -0,0 +1,10 @@
+from django.conf import settings
+
+from coderr_core.counters import BufferedCounter
+
+# Views per offer, incremented by `OfferViewSet.retrieve` and flushed in batches by the serving processes
+offer_view_counter = BufferedCounter(
+    'offers_app.Offer', 'views',
+    flush_interval=getattr(settings, 'OFFER_VIEW_COUNTER_FLUSH_INTERVAL', 10),
+    max_pending=getattr(settings, 'OFFER_VIEW_COUNTER_MAX_PENDING', 10000),
+)
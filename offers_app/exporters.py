@@ -0,0 +1,121 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from .models import OfferDetail
+
+OFFER_COLUMNS = [
+    'id', 'user', 'title', 'description', 'image', 'created_at', 'updated_at',
+    'min_price', 'min_delivery_time', 'max_delivery_time',
+]
+DETAIL_COLUMNS = ['id', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type']
+
+
+def get_export_chunk_size():
+    """
+    Returns the number of offers fetched per database round trip (`OFFER_EXPORT_CHUNK_SIZE`, default 500).
+    """
+    return getattr(settings, 'OFFER_EXPORT_CHUNK_SIZE', 500)
+
+
+class EchoBuffer:
+    """
+    File-like object that returns what is written to it instead of buffering it, so `csv.writer`
+    can produce one line at a time.
+    """
+    def write(self, value):
+        return value
+
+
+class OfferExporter:
+    """
+    Exports the offers of a queryset with their details as NDJSON (one offer object with a nested `details`
+    list per line) or CSV (one row per detail, offer columns repeated, features as a JSON list).
+    Offers are fetched with chunked server-side iteration and every line is produced on demand, so memory
+    stays constant regardless of the size of the catalog.
+    """
+    formats = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+    def __init__(self, queryset, output_format='ndjson', chunk_size=None, request=None):
+        if output_format not in self.formats:
+            raise ValueError(f"Unsupported export format: {output_format}")
+        self.queryset = queryset
+        self.output_format = output_format
+        self.chunk_size = chunk_size or get_export_chunk_size()
+        self.request = request
+
+    @property
+    def content_type(self):
+        return self.formats[self.output_format]
+
+    def get_queryset(self):
+        """
+        Prefetches the details per chunk of offers and drops the list-only prefetches and joins.
+        """
+        return self.queryset.select_related(None).prefetch_related(None).prefetch_related(
+            Prefetch('details', queryset=OfferDetail.objects.order_by('id'))
+        )
+
+    def iter_offers(self):
+        """
+        Yields the export records of the offers, one chunk of offers and details in memory at a time.
+        """
+        for offer in self.get_queryset().iterator(chunk_size=self.chunk_size):
+            yield self.offer_record(offer)
+
+    def offer_record(self, offer):
+        """
+        Returns the export record of an offer with its details.
+        """
+        record = {column: getattr(offer, column) for column in OFFER_COLUMNS if column not in ('user', 'image')}
+        record['user'] = offer.user_id
+        record['image'] = offer.image.url if offer.image else None
+        if record['image'] and self.request is not None:
+            record['image'] = self.request.build_absolute_uri(record['image'])
+        return {
+            **{column: record[column] for column in OFFER_COLUMNS},
+            'details': [
+                {column: getattr(detail, column) for column in DETAIL_COLUMNS} for detail in offer.details.all()
+            ],
+        }
+
+    def stream(self):
+        """
+        Yields the export as text lines in the configured format.
+        """
+        if self.output_format == 'csv':
+            yield from self.stream_csv()
+        else:
+            yield from self.stream_ndjson()
+
+    def stream_ndjson(self):
+        for record in self.iter_offers():
+            yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+    def stream_csv(self):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow([*OFFER_COLUMNS, *(f'detail_{column}' for column in DETAIL_COLUMNS)])
+        encoder = DjangoJSONEncoder()
+        for record in self.iter_offers():
+            offer_values = [self.csv_value(record[column], encoder) for column in OFFER_COLUMNS]
+            if not record['details']:
+                yield writer.writerow([*offer_values, *([''] * len(DETAIL_COLUMNS))])
+            for detail in record['details']:
+                detail_values = [
+                    json.dumps(detail[column]) if column == 'features' else self.csv_value(detail[column], encoder)
+                    for column in DETAIL_COLUMNS
+                ]
+                yield writer.writerow([*offer_values, *detail_values])
+
+    def csv_value(self, value, encoder):
+        """
+        Formats a value for a CSV cell: empty for None and ISO 8601 for datetimes.
+        """
+        if value is None:
+            return ''
+        if isinstance(value, (str, int, float)):
+            return value
+        return encoder.default(value)
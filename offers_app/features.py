@@ -0,0 +1,116 @@
+from django.db.models import Count, Min
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import OfferDetail, OfferFeature
+from .signals import offer_details_bulk_changed
+
+TOKEN_MAX_LENGTH = OfferFeature._meta.get_field('token').max_length
+INDEX_CHUNK_SIZE = 500
+
+
+def normalize_feature(feature):
+    """
+    Returns the index token of a feature name: case-folded with collapsed whitespace, or an empty string
+    for blank or non-text values.
+    """
+    if not isinstance(feature, str):
+        return ''
+    return ' '.join(feature.casefold().split())[:TOKEN_MAX_LENGTH]
+
+
+def build_feature_rows(details):
+    """
+    Returns the unsaved index rows of the given details, one per distinct token and detail.
+    """
+    rows = []
+    for detail in details:
+        tokens = {}
+        for feature in detail.features if isinstance(detail.features, list) else []:
+            token = normalize_feature(feature)
+            if token:
+                tokens.setdefault(token, ' '.join(feature.split())[:TOKEN_MAX_LENGTH])
+        rows.extend(
+            OfferFeature(detail_id=detail.pk, offer_id=detail.offer_id, token=token, name=name)
+            for token, name in tokens.items()
+        )
+    return rows
+
+
+def index_offer_features(offer_ids, using='default'):
+    """
+    (Re)builds the feature index rows of the details of the given offers.
+    """
+    offer_ids = list(offer_ids)
+    for start in range(0, len(offer_ids), INDEX_CHUNK_SIZE):
+        chunk = offer_ids[start:start + INDEX_CHUNK_SIZE]
+        OfferFeature.objects.using(using).filter(offer_id__in=chunk).delete()
+        details = OfferDetail.objects.using(using).filter(offer_id__in=chunk).only('id', 'offer_id', 'features')
+        OfferFeature.objects.using(using).bulk_create(build_feature_rows(details), batch_size=INDEX_CHUNK_SIZE)
+
+
+def rebuild_feature_index(using='default'):
+    """
+    Rebuilds the feature index for all offer details and returns the number of index rows.
+    """
+    OfferFeature.objects.using(using).all().delete()
+    rows = 0
+    details = OfferDetail.objects.using(using).only('id', 'offer_id', 'features').order_by('pk')
+    batch = []
+    for detail in details.iterator(chunk_size=INDEX_CHUNK_SIZE):
+        batch.append(detail)
+        if len(batch) == INDEX_CHUNK_SIZE:
+            rows += len(OfferFeature.objects.using(using).bulk_create(build_feature_rows(batch)))
+            batch = []
+    rows += len(OfferFeature.objects.using(using).bulk_create(build_feature_rows(batch)))
+    return rows
+
+
+def parse_feature_query(value):
+    """
+    Parses the `features` filter value into a list of token groups: groups are separated by commas and must
+    all match (AND), the alternatives of a group are separated by `|` and any of them may match (OR).
+    `logo design|branding,responsive` yields `[['logo design', 'branding'], ['responsive']]`.
+    """
+    groups = []
+    for group in value.split(','):
+        tokens = list(dict.fromkeys(token for token in map(normalize_feature, group.split('|')) if token))
+        if tokens:
+            groups.append(tokens)
+    return groups
+
+
+def autocomplete_features(prefix, limit=10, using='default'):
+    """
+    Returns the indexed features starting with the given prefix, most offered first, with the number
+    of offers that provide them.
+    """
+    token = normalize_feature(prefix)
+    queryset = OfferFeature.objects.using(using).all()
+    if token:
+        # A range over the normalized tokens uses the (token, offer) index, unlike LIKE on SQLite
+        queryset = queryset.filter(token__gte=token, token__lt=token + '\U0010ffff')
+    return list(
+        queryset.values('token')
+        .annotate(name=Min('name'), count=Count('offer', distinct=True))
+        .order_by('-count', 'token')[:limit]
+    )
+
+
+@receiver(post_save, sender=OfferDetail)
+def index_saved_detail_features(sender, instance, using, **kwargs):
+    """
+    Reindexes the features of a saved detail. Rows of deleted details are removed by the cascade.
+    """
+    OfferFeature.objects.using(using).filter(detail_id=instance.pk).delete()
+    OfferFeature.objects.using(using).bulk_create(build_feature_rows([instance]))
+
+
+@receiver(offer_details_bulk_changed)
+def index_bulk_changed_features(sender, offer_ids, using='default', fields=None, **kwargs):
+    """
+    Reindexes the features of offers whose details were written in bulk, unless only other fields were updated.
+    """
+    if fields is not None and 'features' not in fields:
+        return
+    index_offer_features(offer_ids, using)
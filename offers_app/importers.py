@@ -0,0 +1,103 @@
+import json
+
+from django.conf import settings
+from django.db import transaction
+
+from .api.serializers import OfferCreateSerializer
+from .models import Offer, OfferDetail
+from .signals import offer_details_bulk_changed
+
+
+def get_import_chunk_size():
+    """
+    Returns the number of offers inserted per transaction (`OFFER_IMPORT_CHUNK_SIZE`, default 500).
+    """
+    return getattr(settings, 'OFFER_IMPORT_CHUNK_SIZE', 500)
+
+
+class OfferImporter:
+    """
+    Imports offers with their details from NDJSON lines (one offer object per line, same format as
+    `POST /api/offers/` without image). Every line is validated with `OfferCreateSerializer`; valid offers
+    are inserted in chunked `bulk_create` transactions and invalid lines are reported without aborting the batch.
+    Lines are consumed lazily and only a bounded number of errors is kept, so memory does not grow with the input.
+    """
+    def __init__(self, user, chunk_size=None, max_reported_errors=100, using='default', error_callback=None):
+        self.user = user
+        self.chunk_size = chunk_size or get_import_chunk_size()
+        self.max_reported_errors = max_reported_errors
+        self.using = using
+        self.error_callback = error_callback
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, lines):
+        """
+        Validates and imports all lines and returns the import summary.
+        """
+        pending = []
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', errors='replace')
+            if not line.strip():
+                continue
+            validated_data = self.validate_line(line_number, line)
+            if validated_data is not None:
+                pending.append(validated_data)
+            if len(pending) >= self.chunk_size:
+                self.insert_chunk(pending)
+                pending = []
+        if pending:
+            self.insert_chunk(pending)
+        return self.summary()
+
+    def validate_line(self, line_number, line):
+        """
+        Parses and validates a single line. Returns the validated data or None after reporting the errors.
+        """
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            self.report_error(line_number, {'non_field_errors': [f"Invalid JSON: {error}"]})
+            return None
+        if not isinstance(record, dict):
+            self.report_error(line_number, {'non_field_errors': ["Each line must contain a JSON object."]})
+            return None
+        serializer = OfferCreateSerializer(data=record)
+        if not serializer.is_valid():
+            self.report_error(line_number, serializer.errors)
+            return None
+        return serializer.validated_data
+
+    def insert_chunk(self, chunk):
+        """
+        Inserts a chunk of validated offers and their details in one transaction with two `bulk_create` calls.
+        """
+        with transaction.atomic(using=self.using):
+            offers = Offer.objects.using(self.using).bulk_create([
+                Offer(user=self.user, title=data['title'], description=data['description']) for data in chunk
+            ])
+            OfferDetail.objects.using(self.using).bulk_create([
+                OfferDetail(offer=offer, **detail) for offer, data in zip(offers, chunk) for detail in data['details']
+            ])
+            offer_details_bulk_changed.send(sender=Offer, offer_ids=[offer.pk for offer in offers], using=self.using)
+        self.created += len(offers)
+
+    def report_error(self, line_number, errors):
+        """
+        Counts an invalid line, keeps its errors up to `max_reported_errors` and passes them to the error callback.
+        """
+        self.failed += 1
+        error = {'line': line_number, 'errors': errors}
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append(error)
+        if self.error_callback:
+            self.error_callback(error)
+
+    def summary(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+
+from offers_app.models import Offer, OfferDetail
+from offers_app.search import index_offers
+
+
+def find_duplicate_details():
+    """
+    Returns a dict of (offer id, offer_type) to the ids of its details, oldest first, for every offer
+    with several details of the same offer_type.
+    """
+    groups = (
+        OfferDetail.objects.values('offer', 'offer_type').annotate(count=Count('id')).filter(count__gt=1)
+        .values_list('offer', 'offer_type')
+    )
+    duplicates = {group: [] for group in groups}
+    if duplicates:
+        details = OfferDetail.objects.filter(offer__in={offer_id for offer_id, offer_type in duplicates})
+        for detail_id, offer_id, offer_type in details.order_by('id').values_list('id', 'offer_id', 'offer_type'):
+            if (offer_id, offer_type) in duplicates:
+                duplicates[offer_id, offer_type].append(detail_id)
+    return duplicates
+
+
+def delete_details(detail_ids, offer_ids):
+    """
+    Deletes the details with a plain DELETE and refreshes the summary columns and search index of their offers.
+    The statement bypasses the ORM collector, so the command also runs on the schema before the migration
+    that adds the unique constraint, where the tables of later migrations do not exist yet.
+    """
+    placeholders = ', '.join(['%s'] * len(detail_ids))
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {OfferDetail._meta.db_table} WHERE id IN ({placeholders})', detail_ids)
+        Offer.objects.filter(pk__in=offer_ids).update_detail_summary(touch=False)
+        index_offers(offer_ids)
+
+
+class Command(BaseCommand):
+    """
+    Lists offers with several details of the same offer_type, which block the unique (offer, offer_type)
+    constraint of migration 0008, and with `--delete` removes all but the oldest detail of each group.
+    Run it without `--delete` first and review the reported details, the deletion cannot be undone.
+    """
+    help = "Reports and optionally deletes duplicate offer details per offer and offer_type."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help="Delete all but the oldest detail of each group.")
+
+    def handle(self, *args, **options):
+        duplicates = find_duplicate_details()
+        if not duplicates:
+            self.stdout.write(self.style.SUCCESS("No duplicate offer details found."))
+            return
+        removed_ids = []
+        for (offer_id, offer_type), detail_ids in sorted(duplicates.items()):
+            kept_id, *duplicate_ids = detail_ids
+            removed_ids.extend(duplicate_ids)
+            self.stdout.write(f"Offer {offer_id} ({offer_type}): keeping detail {kept_id}, duplicates {duplicate_ids}")
+        if not options['delete']:
+            self.stdout.write(self.style.WARNING(
+                f"Found {len(removed_ids)} duplicate detail(s). Re-run with --delete to remove them."
+            ))
+            return
+        delete_details(removed_ids, sorted({offer_id for offer_id, offer_type in duplicates}))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {len(removed_ids)} duplicate detail(s)."))
@@ -0,0 +1,59 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from offers_app.api.filters import OfferFilter
+from offers_app.exporters import OfferExporter
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Streams the offer catalog with its details into an NDJSON or CSV file, optionally narrowed by the
+    filters of the offer list (e.g. `--filter creator_id=3 --filter features=logo design`).
+    """
+    help = "Exports offers with their details as NDJSON or CSV ('-' writes to stdout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path of the output file or '-' for stdout.")
+        parser.add_argument('--output-format', choices=list(OfferExporter.formats), default='ndjson')
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE',
+                            help="Offer list filter, may be given multiple times.")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Offers fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        exporter = OfferExporter(
+            self.get_queryset(options['filter']), options['output_format'], chunk_size=options['chunk_size']
+        )
+        if options['path'] == '-':
+            exported = self.write(exporter, sys.stdout)
+        else:
+            try:
+                with open(options['path'], 'w', encoding='utf-8', newline='') as file:
+                    exported = self.write(exporter, file)
+            except OSError as error:
+                raise CommandError(f"Could not write '{options['path']}': {error}")
+            self.stdout.write(self.style.SUCCESS(f"Exported {exported} line(s) to {options['path']}."))
+
+    def get_queryset(self, filters):
+        """
+        Applies the `NAME=VALUE` filters with `OfferFilter` and orders the offers by id.
+        """
+        data = QueryDict(mutable=True)
+        for item in filters:
+            name, separator, value = item.partition('=')
+            if not separator or name not in OfferFilter.base_filters:
+                raise CommandError(f"Invalid filter '{item}', expected NAME=VALUE with NAME one of: {', '.join(OfferFilter.base_filters)}.")
+            data.appendlist(name, value)
+        filterset = OfferFilter(data=data, queryset=Offer.objects.order_by('id'))
+        if not filterset.is_valid():
+            raise CommandError(f"Invalid filter: {filterset.errors.as_json()}")
+        return filterset.qs
+
+    def write(self, exporter, file):
+        exported = 0
+        for line in exporter.stream():
+            file.write(line)
+            exported += 1
+        return exported
@@ -0,0 +1,41 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from offers_app.importers import OfferImporter
+
+
+class Command(BaseCommand):
+    """
+    Streams offers with their details from an NDJSON file into the database for a business user.
+    """
+    help = "Imports offers from an NDJSON file (one offer per line, '-' reads from stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path of the NDJSON file or '-' for stdin.")
+        parser.add_argument('--user', required=True, help="Username of the business user owning the offers.")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Offers inserted per transaction.")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+        if user.type != 'business' and not user.is_superuser:
+            raise CommandError(f"User '{user.username}' is not a business user.")
+
+        importer = OfferImporter(user, chunk_size=options['chunk_size'], error_callback=self.write_error)
+        if options['path'] == '-':
+            summary = importer.run(sys.stdin)
+        else:
+            try:
+                with open(options['path'], encoding='utf-8') as file:
+                    summary = importer.run(file)
+            except OSError as error:
+                raise CommandError(f"Could not read '{options['path']}': {error}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {summary['created']} offer(s), {summary['failed']} line(s) failed."))
+
+    def write_error(self, error):
+        self.stderr.write(f"Line {error['line']}: {json.dumps(error['errors'])}")
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from offers_app.changes import get_tombstone_retention, prune_tombstones
+
+
+class Command(BaseCommand):
+    """
+    Deletes the tombstones of deleted offers that are older than the change feed retention.
+    Change feed cursors older than the retention are answered with 410 and resync from scratch.
+    """
+    help = "Deletes offer tombstones older than OFFER_TOMBSTONE_RETENTION_DAYS (or --days)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Retention in days, defaults to the setting.")
+
+    def handle(self, *args, **options):
+        retention = timedelta(days=options['days']) if options['days'] is not None else get_tombstone_retention()
+        deleted = prune_tombstones(timezone.now() - retention)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstone(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.features import rebuild_feature_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the feature index used by the `features` filter and the feature autocomplete of the offer list.
+    """
+    help = "Rebuilds the feature index of all offer details."
+
+    def handle(self, *args, **options):
+        indexed = rebuild_feature_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} feature(s)."))
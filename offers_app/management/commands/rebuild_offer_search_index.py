@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.search import rebuild_index, search_index_available
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the SQLite FTS5 index used by the `search` parameter of the offer list.
+    """
+    help = "Rebuilds the full-text search index of all offers."
+
+    def handle(self, *args, **options):
+        if not search_index_available():
+            self.stdout.write(self.style.WARNING("The full-text index is only available on SQLite with FTS5."))
+            return
+        indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} offer(s)."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the denormalized `min_price`, `min_delivery_time` and `max_delivery_time` columns of all offers
+    from their `OfferDetail` instances, e.g. after importing data without signals.
+    `updated_at` is left untouched so that a repair run does not reorder the default `updated_at` listing.
+    """
+    help = "Recalculates the denormalized price and delivery time columns of all offers."
+
+    def handle(self, *args, **options):
+        updated = Offer.objects.all().update_detail_summary(touch=False)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt detail summary for {updated} offer(s)."))
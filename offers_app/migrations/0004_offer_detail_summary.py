@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:59
+
+from django.db import migrations, models
+from django.db.models import Min, Max, OuterRef, Subquery
+
+
+def fill_detail_summary(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+
+    def detail_aggregate(aggregate):
+        return Subquery(
+            OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+            .annotate(value=aggregate).values('value')[:1]
+        )
+
+    Offer.objects.update(
+        min_price=detail_aggregate(Min('price')),
+        min_delivery_time=detail_aggregate(Min('delivery_time_in_days')),
+        max_delivery_time=detail_aggregate(Max('delivery_time_in_days')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_alter_offer_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='max_delivery_time',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_detail_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+import sqlite3
+
+import django.db.models.deletion
+import offers_app.models
+from django.db import migrations, models
+
+
+def fts5_available(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        probe = sqlite3.connect(':memory:')
+        probe.execute('CREATE VIRTUAL TABLE probe USING fts5(content)')
+        probe.close()
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Creates the FTS5 table for offer search on SQLite and fills it from the existing offers.
+    Other databases keep using the icontains fallback of the search filter.
+    """
+    if not fts5_available(schema_editor.connection):
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS offers_app_offer_fts "
+        "USING fts5(title, description, details, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO offers_app_offer_fts (rowid, title, description, details) "
+        "SELECT o.id, o.title, o.description, COALESCE(("
+        "SELECT group_concat(d.title || ' ' || d.features, ' ') "
+        "FROM offers_app_offerdetail d WHERE d.offer_id = o.id), '') "
+        "FROM offers_app_offer o"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS offers_app_offer_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0004_offer_detail_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.CreateModel(
+            name='OfferSearchIndex',
+            fields=[
+                ('offer', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='offers_app.offer')),
+                ('document', offers_app.models.FullTextField(db_column='offers_app_offer_fts')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('details', models.TextField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'offers_app_offer_fts',
+                'managed': False,
+            },
+        ),
+    ]
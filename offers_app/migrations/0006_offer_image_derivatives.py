@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0005_offer_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
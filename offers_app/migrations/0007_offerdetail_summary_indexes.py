@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0006_offer_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer', 'delivery_time_in_days'], name='offerdetail_offer_delivery_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:31
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_details(apps, schema_editor):
+    """
+    Refuses to add the unique constraint while offers have several details of the same offer_type. The duplicates
+    are readable through the API, so they are not deleted here; review them and remove them with the
+    `dedupe_offer_details` command before migrating.
+    """
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    duplicates = list(
+        OfferDetail.objects.using(schema_editor.connection.alias).values('offer', 'offer_type')
+        .annotate(count=Count('id')).filter(count__gt=1).order_by('offer', 'offer_type')
+        .values_list('offer', 'offer_type')
+    )
+    if duplicates:
+        listed = ', '.join(f"offer {offer_id} ({offer_type})" for offer_id, offer_type in duplicates)
+        raise RuntimeError(
+            f"Cannot add the unique (offer, offer_type) constraint, these offers have duplicate details: {listed}. "
+            "Review them with `python manage.py dedupe_offer_details` and delete them with its `--delete` option "
+            "before migrating."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0007_offerdetail_summary_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['updated_at', 'id'], name='offer_updated_at_id_idx'),
+        ),
+        migrations.RunPython(check_duplicate_details, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='offerdetail',
+            constraint=models.UniqueConstraint(fields=('offer', 'offer_type'), name='offerdetail_unique_offer_type'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_feature_index(apps, schema_editor):
+    """
+    Fills the feature index from the features of the existing offer details.
+    """
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    OfferFeature = apps.get_model('offers_app', 'OfferFeature')
+    db_alias = schema_editor.connection.alias
+    rows = []
+    for detail in OfferDetail.objects.using(db_alias).only('id', 'offer_id', 'features').iterator(chunk_size=500):
+        tokens = {}
+        for feature in detail.features if isinstance(detail.features, list) else []:
+            if isinstance(feature, str) and feature.strip():
+                tokens.setdefault(' '.join(feature.casefold().split())[:100], ' '.join(feature.split())[:100])
+        rows.extend(
+            OfferFeature(detail_id=detail.pk, offer_id=detail.offer_id, token=token, name=name)
+            for token, name in tokens.items()
+        )
+    OfferFeature.objects.using(db_alias).bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0008_offer_indexes_unique_offer_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=100)),
+                ('detail', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_tokens', to='offers_app.offerdetail')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_tokens', to='offers_app.offer')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'offer'], name='offerfeature_token_offer_idx')],
+                'constraints': [models.UniqueConstraint(fields=('detail', 'token'), name='offerfeature_unique_detail_token')],
+            },
+        ),
+        migrations.RunPython(build_feature_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0009_offer_feature_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='views',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['views', 'id'], name='offer_views_id_idx'),
+        ),
+    ]
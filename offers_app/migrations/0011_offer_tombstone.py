@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0010_offer_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offer_id', models.BigIntegerField(unique=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['deleted_at', 'offer_id'], name='offertombstone_deleted_idx')],
+            },
+        ),
+    ]
@@ -4,15 +4,92 @@ from django.db import models
 from django.core.validators import FileExtensionValidator
 from django.core.files.storage import default_storage
 from django.dispatch import receiver
-from django.db.models.signals import post_delete
+from django.db.models import Count, Exists, Min, Max, OuterRef, Q, Subquery
+from django.db.models.signals import post_delete, post_save
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 
+from coderr_core.images import delete_image_derivatives, delete_stored_derivatives, schedule_image_derivatives
+from coderr_core.mixins import DirtyFieldsMixin
 from .api.utils import validate_file_size
+from .signals import offer_details_bulk_changed
 
 
 # Create your models here.
 
-class Offer(models.Model):
+DETAIL_SUMMARY_FIELDS = ['min_price', 'min_delivery_time', 'max_delivery_time']
+
+
+class OfferQuerySet(models.QuerySet):
+    """
+    Custom queryset for `Offer` that keeps the denormalized detail summary columns in sync
+    and computes the facet counts of the offer filter sidebar.
+    """
+    def update_detail_summary(self, touch=True):
+        """
+        Recalculates `min_price`, `min_delivery_time` and `max_delivery_time` for all offers in the queryset
+        from their related `OfferDetail` instances using a single UPDATE statement.
+        With `touch` the offers' `updated_at` is bumped as well, since a detail change alters the offer
+        representation and therefore its `Last-Modified` and `ETag` validators.
+        """
+        def detail_aggregate(aggregate):
+            return Subquery(
+                OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+                .annotate(value=aggregate).values('value')[:1]
+            )
+
+        values = {
+            'min_price': detail_aggregate(Min('price')),
+            'min_delivery_time': detail_aggregate(Min('delivery_time_in_days')),
+            'max_delivery_time': detail_aggregate(Max('delivery_time_in_days')),
+        }
+        if touch:
+            values['updated_at'] = timezone.now()
+        return self.update(**values)
+
+    def facets(self, price_edges, delivery_time_edges):
+        """
+        Counts the offers in the queryset per `min_price` bucket, per `min_delivery_time` bucket and per
+        `offer_type` of their details with a single aggregate query.
+        Price buckets include their lower edge (`gte`/`lt`), matching the `min_price` filter; delivery time
+        buckets include their upper edge (`gt`/`lte`), matching the `max_delivery_time` filter.
+        Offers without details have no summary and are only part of the total count.
+        """
+        price_buckets = [
+            {'gte': lower, 'lt': upper} for lower, upper in zip(price_edges, [*price_edges[1:], None])
+        ]
+        delivery_time_buckets = [
+            {'gt': lower, 'lte': upper} for lower, upper in zip([None, *delivery_time_edges], [*delivery_time_edges, None])
+        ]
+        offer_types = [value for value, label in OfferDetail._meta.get_field('offer_type').choices]
+
+        def bucket_condition(field, bucket):
+            return Q(**{f"{field}__{lookup}": edge for lookup, edge in bucket.items() if edge is not None})
+
+        aggregates = {'count': Count('pk')}
+        for index, bucket in enumerate(price_buckets):
+            aggregates[f'price_{index}'] = Count('pk', filter=bucket_condition('min_price', bucket))
+        for index, bucket in enumerate(delivery_time_buckets):
+            aggregates[f'delivery_time_{index}'] = Count('pk', filter=bucket_condition('min_delivery_time', bucket))
+        for offer_type in offer_types:
+            aggregates[f'offer_type_{offer_type}'] = Count('pk', filter=Q(Exists(
+                OfferDetail.objects.filter(offer=OuterRef('pk'), offer_type=offer_type)
+            )))
+        counts = self.order_by().aggregate(**aggregates)
+
+        return {
+            'count': counts['count'],
+            'min_price': [
+                {**bucket, 'count': counts[f'price_{index}']} for index, bucket in enumerate(price_buckets)
+            ],
+            'delivery_time': [
+                {**bucket, 'count': counts[f'delivery_time_{index}']} for index, bucket in enumerate(delivery_time_buckets)
+            ],
+            'offer_type': {offer_type: counts[f'offer_type_{offer_type}'] for offer_type in offer_types},
+        }
+
+
+class Offer(DirtyFieldsMixin, models.Model):
     """
     Represents an offer created by a business user, including details such as title, image, description, 
     and associated user, with functionality for managing image uploads and deletions.
@@ -23,23 +100,39 @@ class Offer(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='offers', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.PositiveIntegerField(blank=True, null=True, editable=False, db_index=True)
+    min_delivery_time = models.PositiveSmallIntegerField(blank=True, null=True, editable=False, db_index=True)
+    max_delivery_time = models.PositiveSmallIntegerField(blank=True, null=True, editable=False, db_index=True)
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    views = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        # Default list ordering and its keyset pagination tiebreaker
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_at_id_idx'),
+            # `ordering=-views` (most popular) and its keyset pagination
+            models.Index(fields=['views', 'id'], name='offer_views_id_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         """
-        Saves the offer instance and renames the image if changed, deleting old images if necessary.
+        Saves the offer instance and renames a newly uploaded image. When the image was replaced or removed,
+        the old image and its derivatives are deleted; the change is detected from the loaded field values
+        instead of re-reading the row. Derivatives of a new upload are rendered in the background after the commit.
         """
-        if self.image:
+        image_uploaded = bool(self.image) and not self.image._committed
+        if image_uploaded:
             self.update_image()
-        if self.id:
-            original = Offer.objects.get(pk=self.id)
-            if original.image.name != self.image.name:  # Check if the image has been changed
-                # If the image is changed, delete the old image
-                if original.image:
-                    old_image_path = original.image.path
-                    if os.path.exists(old_image_path):
-                        default_storage.delete(old_image_path)
-                    self.update_image()
+        if self.pk and self.has_snapshot('image') and self.is_dirty('image'):
+            original_image = self.get_original_value('image')
+            if original_image and default_storage.exists(original_image):
+                default_storage.delete(original_image)
+            delete_stored_derivatives(self, 'image_derivatives')
         super(Offer, self).save(*args, **kwargs)
+        if image_uploaded:
+            schedule_image_derivatives(self, 'image', 'image_derivatives')
 
     def update_image(self):
         """
@@ -50,6 +143,14 @@ class Offer(models.Model):
         new_image_name = f"user_{self.user.id}_{self.user.username}_offer_{self.id}.{ext}"
         self.image.name = new_image_name
 
+    def update_detail_summary(self):
+        """
+        Recalculates the denormalized price and delivery time columns of this offer from its details
+        and reloads them, together with the bumped `updated_at`, on the instance.
+        """
+        Offer.objects.filter(pk=self.pk).update_detail_summary()
+        self.refresh_from_db(fields=[*DETAIL_SUMMARY_FIELDS, 'updated_at'])
+
     def delete(self, *args, **kwargs):
         """
         Deletes the associated image file from storage when the offer is deleted.
@@ -70,12 +171,70 @@ class Offer(models.Model):
 @receiver(post_delete, sender=Offer)
 def delete_offer_image(sender, instance, **kwargs):
     """
-    Deletes the associated image from storage when an Offer instance is deleted.
+    Deletes the associated image and its derivatives from storage when an Offer instance is deleted.
     """
     if instance.image:
         image_path = instance.image.path
         if os.path.exists(image_path):
             default_storage.delete(image_path)
+    delete_image_derivatives(instance.image_derivatives)
+
+
+class OfferTombstone(models.Model):
+    """
+    Records the id and deletion time of a deleted offer, so that the change feed can report deletions.
+    Written by the signal receivers in `offers_app.changes` and pruned by `prune_offer_tombstones`.
+    """
+    offer_id = models.BigIntegerField(unique=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # Change feed order and its continuation predicate
+        indexes = [
+            models.Index(fields=['deleted_at', 'offer_id'], name='offertombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the id of the deleted offer and the time of its deletion.
+        """
+        return f"Offer {self.offer_id} deleted at {self.deleted_at}"
+
+
+class FullTextField(models.TextField):
+    """
+    Text column of an FTS5 table that supports the full-text `match` lookup.
+    """
+
+
+@FullTextField.register_lookup
+class FullTextMatch(models.Lookup):
+    """
+    Lookup that compiles to an FTS5 `MATCH` expression.
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class OfferSearchIndex(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 table that indexes offer titles, descriptions and detail texts.
+    The table is created by a migration and kept in sync by the signal receivers in `offers_app.search`.
+    """
+    offer = models.OneToOneField(Offer, primary_key=True, db_column='rowid', related_name='search_index', on_delete=models.DO_NOTHING)
+    document = FullTextField(db_column='offers_app_offer_fts')
+    title = models.TextField()
+    description = models.TextField()
+    details = models.TextField()
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'offers_app_offer_fts'
 
 
 class OfferDetail(models.Model):
@@ -91,6 +250,18 @@ class OfferDetail(models.Model):
     features = models.JSONField(default=list, blank=True)
     offer_type = models.CharField(max_length=25, choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')])
 
+    class Meta:
+        # Every offer has at most one detail per package; the constraint's index also serves the
+        # (offer, offer_type) lookups of updates and facets
+        constraints = [
+            models.UniqueConstraint(fields=['offer', 'offer_type'], name='offerdetail_unique_offer_type'),
+        ]
+        # Serve the MIN/MAX lookups of the detail summary refresh from the index alone
+        indexes = [
+            models.Index(fields=['offer', 'price'], name='offerdetail_offer_price_idx'),
+            models.Index(fields=['offer', 'delivery_time_in_days'], name='offerdetail_offer_delivery_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Validates the offer type and saves the offer detail instance.
@@ -100,3 +271,53 @@ class OfferDetail(models.Model):
         if self.offer_type not in valid_types:
             raise ValueError(f"Invalid offer_type: {self.offer_type}")
         super().save(*args, **kwargs)
+
+
+class OfferFeature(models.Model):
+    """
+    Inverted index over `OfferDetail.features`: one row per normalized feature token and detail, so offers
+    can be filtered by feature and feature names autocompleted without parsing the JSON of every detail.
+    The rows are kept in sync by the signal receivers in `offers_app.features`.
+    """
+    detail = models.ForeignKey(OfferDetail, related_name='feature_tokens', on_delete=models.CASCADE)
+    offer = models.ForeignKey(Offer, related_name='feature_tokens', on_delete=models.CASCADE)
+    token = models.CharField(max_length=100)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['detail', 'token'], name='offerfeature_unique_detail_token'),
+        ]
+        # (token, offer) serves the feature filter's EXISTS lookups and the prefix range of the autocomplete
+        indexes = [
+            models.Index(fields=['token', 'offer'], name='offerfeature_token_offer_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the feature token together with the offer it belongs to.
+        """
+        return f"{self.token} (Offer: {self.offer_id})"
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def update_offer_detail_summary(sender, instance, origin=None, **kwargs):
+    """
+    Keeps the denormalized price and delivery time columns of the related Offer in sync
+    whenever an OfferDetail is saved or deleted. Skipped when the Offer itself is being deleted.
+    """
+    if isinstance(origin, Offer) or getattr(origin, 'model', None) is Offer:
+        return
+    if OfferDetail.offer.is_cached(instance):
+        instance.offer.update_detail_summary()
+    else:
+        Offer.objects.filter(pk=instance.offer_id).update_detail_summary()
+
+
+@receiver(offer_details_bulk_changed)
+def update_bulk_changed_detail_summary(sender, offer_ids, using='default', **kwargs):
+    """
+    Recalculates the denormalized price and delivery time columns after OfferDetail rows were written in bulk.
+    """
+    Offer.objects.using(using).filter(pk__in=offer_ids).update_detail_summary()
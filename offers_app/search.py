@@ -0,0 +1,171 @@
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Offer, OfferDetail, OfferSearchIndex
+from .signals import offer_details_bulk_changed
+
+FTS_TABLE = OfferSearchIndex._meta.db_table
+INDEX_CHUNK_SIZE = 500
+TOKEN_PATTERN = re.compile(r'\w+')
+
+_batch = threading.local()
+
+
+@lru_cache(maxsize=None)
+def sqlite_supports_fts5():
+    """
+    Probes the linked SQLite library once for FTS5 support without touching the project database.
+    """
+    try:
+        probe = sqlite3.connect(':memory:')
+        probe.execute('CREATE VIRTUAL TABLE probe USING fts5(content)')
+        probe.close()
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def search_index_available(using='default'):
+    """
+    Returns whether the offer full-text index exists for the given database, i.e. whether it is SQLite with FTS5.
+    """
+    return connections[using].vendor == 'sqlite' and sqlite_supports_fts5()
+
+
+def build_match_query(search_terms):
+    """
+    Converts search terms into an FTS5 MATCH expression in which every word must match as a prefix,
+    so results already show up while the user is typing. Returns None if no searchable words remain.
+    """
+    tokens = [token for term in search_terms for token in TOKEN_PATTERN.findall(term)]
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def index_offers(offer_ids, using='default'):
+    """
+    (Re)builds the full-text index rows of the given offers from their title, description and the titles
+    and features of their details. Offers that no longer exist are removed from the index.
+    """
+    if not search_index_available(using):
+        return
+    offer_ids = list(offer_ids)
+    for start in range(0, len(offer_ids), INDEX_CHUNK_SIZE):
+        chunk = offer_ids[start:start + INDEX_CHUNK_SIZE]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+            cursor.execute(f'{index_select_sql()} WHERE o.id IN ({placeholders})', chunk)
+
+
+@contextmanager
+def batched_indexing():
+    """
+    Collects the offers the receivers would reindex within the block and reindexes each of them once when the
+    block exits, e.g. when an offer and its details are written by separate statements. Nothing is indexed if
+    the block raises; nested blocks join the outer one.
+    """
+    if getattr(_batch, 'pending', None) is not None:
+        yield
+        return
+    _batch.pending = {}
+    try:
+        yield
+        pending = _batch.pending
+    finally:
+        _batch.pending = None
+    for using, offer_ids in pending.items():
+        index_offers(sorted(offer_ids), using)
+
+
+def queue_offers(offer_ids, using='default'):
+    """
+    Reindexes the given offers now, or once at the end of the enclosing `batched_indexing` block.
+    """
+    pending = getattr(_batch, 'pending', None)
+    if pending is None:
+        index_offers(offer_ids, using)
+    else:
+        pending.setdefault(using, set()).update(offer_ids)
+
+
+def remove_offers(offer_ids, using='default'):
+    """
+    Removes the given offers from the full-text index.
+    """
+    if not search_index_available(using):
+        return
+    offer_ids = list(offer_ids)
+    for start in range(0, len(offer_ids), INDEX_CHUNK_SIZE):
+        chunk = offer_ids[start:start + INDEX_CHUNK_SIZE]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+
+
+def rebuild_index(using='default'):
+    """
+    Rebuilds the full-text index for all offers and returns the number of indexed offers.
+    """
+    if not search_index_available(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(index_select_sql())
+        return cursor.rowcount
+
+
+def index_select_sql():
+    """
+    Returns the INSERT ... SELECT statement that copies offers and their detail texts into the index.
+    """
+    return (
+        f'INSERT INTO {FTS_TABLE} (rowid, title, description, details) '
+        f'SELECT o.id, o.title, o.description, COALESCE(('
+        f'SELECT group_concat(d.title || \' \' || d.features, \' \') '
+        f'FROM {OfferDetail._meta.db_table} d WHERE d.offer_id = o.id), \'\') '
+        f'FROM {Offer._meta.db_table} o'
+    )
+
+
+@receiver(post_save, sender=Offer)
+def index_saved_offer(sender, instance, using, **kwargs):
+    """
+    Reindexes an offer after it has been saved.
+    """
+    queue_offers([instance.pk], using)
+
+
+@receiver(post_delete, sender=Offer)
+def remove_deleted_offer(sender, instance, using, **kwargs):
+    """
+    Removes a deleted offer from the full-text index.
+    """
+    remove_offers([instance.pk], using)
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def index_offer_of_detail(sender, instance, using, origin=None, **kwargs):
+    """
+    Reindexes the offer of a saved or deleted detail, unless the offer itself is being deleted.
+    """
+    if isinstance(origin, Offer) or getattr(origin, 'model', None) is Offer:
+        return
+    queue_offers([instance.offer_id], using)
+
+
+@receiver(offer_details_bulk_changed)
+def index_bulk_changed_offers(sender, offer_ids, using='default', **kwargs):
+    """
+    Reindexes offers whose details were written in bulk.
+    """
+    queue_offers(offer_ids, using)
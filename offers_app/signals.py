@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent with `offer_ids` and `using` after OfferDetail rows of these offers were written in bulk
+# (bulk_create / bulk_update), which bypasses the post_save and post_delete signals of the model.
+# A bulk_update may pass the written `fields`; receivers that only depend on some fields can skip the others.
+offer_details_bulk_changed = Signal()
@@ -0,0 +1,228 @@
+import csv
+import importlib
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from offers_app.models import Offer, OfferDetail, OfferFeature, OfferTombstone
+
+
+class RebuildOfferSummariesCommandTest(TestCase):
+    """
+    Test suite for the `rebuild_offer_summaries` management command.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password")
+        self.offer = Offer.objects.create(title="Test Offer", description="Test", user=self.user)
+        OfferDetail.objects.bulk_create([
+            OfferDetail(offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5, price=80, offer_type="basic"),
+            OfferDetail(offer=self.offer, title="Premium", revisions=3, delivery_time_in_days=2, price=240, offer_type="premium"),
+        ])
+        self.empty_offer = Offer.objects.create(title="Empty Offer", description="Test", user=self.user)
+
+    def test_rebuild_fills_summary_columns(self):
+        """
+        Test that the command recalculates summary columns that were bypassed by bulk_create.
+        """
+        self.assertIsNone(Offer.objects.get(pk=self.offer.pk).min_price)
+        out = StringIO()
+        call_command("rebuild_offer_summaries", stdout=out)
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual(offer.min_price, 80)
+        self.assertEqual(offer.min_delivery_time, 2)
+        self.assertEqual(offer.max_delivery_time, 5)
+        self.assertIsNone(Offer.objects.get(pk=self.empty_offer.pk).min_price)
+        self.assertIn("2 offer(s)", out.getvalue())
+
+
+class RebuildOfferSearchIndexCommandTest(TestCase):
+    """
+    Test suite for the `rebuild_offer_search_index` management command.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password")
+        self.offer = Offer.objects.create(title="Logo Design", description="Test", user=self.user)
+        OfferDetail.objects.bulk_create([
+            OfferDetail(offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5, price=80, features=["Favicon"], offer_type="basic"),
+        ])
+
+    def test_rebuild_indexes_bulk_created_details(self):
+        """
+        Test that the command indexes detail features that were bypassed by bulk_create.
+        """
+        self.assertFalse(Offer.objects.filter(search_index__document__match='favicon').exists())
+        out = StringIO()
+        call_command("rebuild_offer_search_index", stdout=out)
+        self.assertTrue(Offer.objects.filter(search_index__document__match='favicon').exists())
+        self.assertIn("Indexed 1 offer(s)", out.getvalue())
+
+
+class ImportOffersCommandTest(TestCase):
+    """
+    Test suite for the `import_offers` management command.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="business", password="password", type="business")
+        detail = {"title": "Basic", "revisions": 1, "delivery_time_in_days": 4, "price": 70, "features": [], "offer_type": "basic"}
+        lines = [json.dumps({'title': f'Offer {index}', 'description': 'Imported', 'details': [detail]}) for index in range(5)]
+        lines.insert(2, json.dumps({'title': 'Broken', 'description': 'Imported', 'details': [{**detail, 'price': -1}]}))
+        handle, self.path = tempfile.mkstemp(suffix='.ndjson')
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(lines))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_import_in_chunks(self):
+        """
+        Test that all valid lines are imported across several chunks and invalid lines are reported.
+        """
+        out, err = StringIO(), StringIO()
+        call_command("import_offers", self.path, user="business", chunk_size=2, stdout=out, stderr=err)
+        self.assertEqual(Offer.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(Offer.objects.filter(min_price=70).count(), 5)
+        self.assertIn("Imported 5 offer(s), 1 line(s) failed.", out.getvalue())
+        self.assertIn("Line 3:", err.getvalue())
+
+
+class ExportOffersCommandTest(TestCase):
+    """
+    Test suite for the `export_offers` management command.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="business", password="password", type="business")
+        for index in range(3):
+            offer = Offer.objects.create(title=f"Offer {index}", description="Export", user=self.user)
+            OfferDetail.objects.create(offer=offer, title="Basic", revisions=1, delivery_time_in_days=4, price=70 + index, features=[], offer_type="basic")
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_export_filtered_csv(self):
+        """
+        Test that the command writes the filtered offers as CSV in chunks.
+        """
+        out = StringIO()
+        call_command("export_offers", self.path, output_format="csv", filter=["min_price=71"], chunk_size=1, stdout=out)
+        with open(self.path, encoding='utf-8', newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([row['title'] for row in rows], ["Offer 1", "Offer 2"])
+        self.assertIn("Exported 3 line(s)", out.getvalue())
+
+    def test_invalid_filter(self):
+        """
+        Test that unknown filters are rejected.
+        """
+        with self.assertRaises(CommandError):
+            call_command("export_offers", self.path, filter=["color=red"])
+
+
+class RebuildOfferFeatureIndexCommandTest(TestCase):
+    """
+    Test suite for the `rebuild_offer_feature_index` management command.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password")
+        self.offer = Offer.objects.create(title="Logo Design", description="Test", user=self.user)
+        OfferDetail.objects.bulk_create([
+            OfferDetail(offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5, price=80, features=["Favicon", "favicon ", "Source Files"], offer_type="basic"),
+        ])
+
+    def test_rebuild_indexes_bulk_created_details(self):
+        """
+        Test that the command indexes the distinct features of details that were bypassed by bulk_create.
+        """
+        self.assertFalse(OfferFeature.objects.exists())
+        out = StringIO()
+        call_command("rebuild_offer_feature_index", stdout=out)
+        self.assertEqual(sorted(OfferFeature.objects.values_list('token', flat=True)), ["favicon", "source files"])
+        self.assertIn("Indexed 2 feature(s)", out.getvalue())
+
+
+class PruneOfferTombstonesCommandTest(TestCase):
+    """
+    Test suite for the `prune_offer_tombstones` management command.
+    """
+    def test_prune_old_tombstones(self):
+        """
+        Test that only tombstones older than the retention are deleted.
+        """
+        OfferTombstone.objects.create(offer_id=1, deleted_at=timezone.now() - timedelta(days=40))
+        OfferTombstone.objects.create(offer_id=2, deleted_at=timezone.now() - timedelta(days=5))
+        out = StringIO()
+        call_command("prune_offer_tombstones", stdout=out)
+        self.assertEqual(list(OfferTombstone.objects.values_list('offer_id', flat=True)), [2])
+        call_command("prune_offer_tombstones", days=1, stdout=out)
+        self.assertFalse(OfferTombstone.objects.exists())
+        self.assertIn("Deleted 1 tombstone(s).", out.getvalue())
+
+
+class DedupeOfferDetailsCommandTest(TransactionTestCase):
+    """
+    Test suite for the `dedupe_offer_details` management command and the duplicate check of migration 0008.
+    The unique (offer, offer_type) constraint is dropped for the test to create the duplicates it prevents.
+    """
+    def setUp(self):
+        self.constraint = next(
+            constraint for constraint in OfferDetail._meta.constraints if constraint.name == 'offerdetail_unique_offer_type'
+        )
+        # SQLite rebuilds the table from the model options, so the model must not declare the constraint either
+        constraints = [constraint for constraint in OfferDetail._meta.constraints if constraint is not self.constraint]
+        with mock.patch.object(OfferDetail._meta, 'constraints', constraints), connection.schema_editor() as schema_editor:
+            schema_editor.remove_constraint(OfferDetail, self.constraint)
+        self.user = get_user_model().objects.create_user(username="testuser", password="password")
+        self.offer = Offer.objects.create(title="Test Offer", description="Test", user=self.user)
+        self.details = OfferDetail.objects.bulk_create([
+            OfferDetail(offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5, price=80, offer_type="basic"),
+            OfferDetail(offer=self.offer, title="Basic copy", revisions=1, delivery_time_in_days=1, price=20, offer_type="basic"),
+            OfferDetail(offer=self.offer, title="Premium", revisions=3, delivery_time_in_days=2, price=240, offer_type="premium"),
+        ])
+        Offer.objects.filter(pk=self.offer.pk).update_detail_summary(touch=False)
+
+    def tearDown(self):
+        OfferDetail.objects.all().delete()
+        with connection.schema_editor() as schema_editor:
+            schema_editor.add_constraint(OfferDetail, self.constraint)
+
+    def test_migration_refuses_duplicates(self):
+        """
+        Test that the migration fails with the offending offers instead of deleting details.
+        """
+        migration = importlib.import_module('offers_app.migrations.0008_offer_indexes_unique_offer_type')
+        with connection.schema_editor() as schema_editor:
+            with self.assertRaisesMessage(RuntimeError, f"offer {self.offer.pk} (basic)"):
+                migration.check_duplicate_details(apps, schema_editor)
+        self.assertEqual(OfferDetail.objects.count(), 3)
+
+    def test_report_then_delete(self):
+        """
+        Test that duplicates are only reported by default and deleted with `--delete`, keeping the oldest detail
+        and refreshing the offer summary.
+        """
+        out = StringIO()
+        call_command("dedupe_offer_details", stdout=out)
+        self.assertIn(f"keeping detail {self.details[0].pk}, duplicates [{self.details[1].pk}]", out.getvalue())
+        self.assertEqual(OfferDetail.objects.count(), 3)
+
+        call_command("dedupe_offer_details", "--delete", stdout=StringIO())
+        self.assertEqual(
+            sorted(OfferDetail.objects.values_list('id', flat=True)), [self.details[0].pk, self.details[2].pk]
+        )
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (80, 2))
+        out = StringIO()
+        call_command("dedupe_offer_details", stdout=out)
+        self.assertIn("No duplicate offer details found.", out.getvalue())
@@ -1,12 +1,19 @@
+import io
 import os
 import tempfile
 
+from PIL import Image
 from django.conf import settings
-from django.test import TestCase
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 
+from coderr_core.images import generate_image_derivatives
+from offers_app.api.serializers import OfferDetailViewSerializer
 from offers_app.models import Offer, OfferDetail
 
 
@@ -247,3 +254,193 @@ class OfferDetailModelTests(TestCase):
         self.assertIn(detail1, offer.details.all())
         self.assertIn(detail2, offer.details.all())
 
+
+class OfferDetailSummaryTests(TestCase):
+    """
+    Test suite for the denormalized price and delivery time columns on the Offer model.
+    """
+
+    def setUp(self):
+        """
+        Create a test user and an offer with two details.
+        """
+        self.user = get_user_model().objects.create_user(username="testuser", password="testpassword")
+        self.offer = Offer.objects.create(title="Test Offer", description="Test Description", user=self.user)
+        self.basic = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=2, delivery_time_in_days=7, price=50, offer_type="basic"
+        )
+        self.premium = OfferDetail.objects.create(
+            offer=self.offer, title="Premium", revisions=5, delivery_time_in_days=3, price=150, offer_type="premium"
+        )
+
+    def test_summary_set_on_detail_create(self):
+        """
+        Ensure the summary columns reflect the details after they are created.
+        """
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual(offer.min_price, 50)
+        self.assertEqual(offer.min_delivery_time, 3)
+        self.assertEqual(offer.max_delivery_time, 7)
+
+    def test_summary_updated_on_detail_change(self):
+        """
+        Ensure the summary columns follow price and delivery time changes of a detail.
+        """
+        self.basic.price = 200
+        self.basic.delivery_time_in_days = 1
+        self.basic.save()
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual(offer.min_price, 150)
+        self.assertEqual(offer.min_delivery_time, 1)
+        self.assertEqual(offer.max_delivery_time, 3)
+
+    def test_summary_updated_on_detail_delete(self):
+        """
+        Ensure the summary columns are recalculated when details are deleted and reset when none are left.
+        """
+        self.basic.delete()
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual(offer.min_price, 150)
+        self.assertEqual(offer.max_delivery_time, 3)
+        OfferDetail.objects.filter(offer=self.offer).delete()
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertIsNone(offer.min_price)
+        self.assertIsNone(offer.min_delivery_time)
+        self.assertIsNone(offer.max_delivery_time)
+
+    def test_summary_refreshed_on_cached_offer(self):
+        """
+        Ensure the offer instance passed to the detail is refreshed as well.
+        """
+        self.assertEqual(self.offer.min_price, 50)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def test_saving_offer_keeps_summary(self):
+        """
+        Ensure saving the offer itself does not reset the summary columns.
+        """
+        offer = Offer.objects.get(pk=self.offer.pk)
+        offer.title = "Updated Title"
+        offer.save()
+        offer.refresh_from_db()
+        self.assertEqual(offer.min_price, 50)
+
+
+class OfferDirtyFieldTests(TestCase):
+    """
+    Test suite for the change detection of loaded offers, which replaces re-reading the row on save.
+    """
+
+    def setUp(self):
+        """
+        Create a test user and an offer.
+        """
+        self.user = get_user_model().objects.create_user(username="testuser", password="testpassword")
+        Offer.objects.create(title="Test Offer", description="Test Description", user=self.user)
+        self.offer = Offer.objects.get()
+
+    def test_dirty_fields(self):
+        """
+        Ensure only assigned fields that differ from the loaded values are reported as changed.
+        """
+        self.assertEqual(self.offer.get_dirty_fields(), [])
+        self.offer.title = "Test Offer"
+        self.offer.description = "Changed"
+        self.assertEqual(self.offer.get_dirty_fields(), ['description'])
+        self.assertEqual(self.offer.get_original_value('description'), "Test Description")
+
+    def test_save_updates_changed_fields_only(self):
+        """
+        Ensure saving a loaded offer issues a single UPDATE of the changed and auto_now fields.
+        """
+        self.offer.title = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            self.offer.save()
+        statements = [query['sql'] for query in queries if query['sql'].startswith(('SELECT "offers_app_offer"', 'UPDATE "offers_app_offer"'))]
+        self.assertEqual(len(statements), 1)
+        self.assertIn('"title"', statements[0])
+        self.assertNotIn('"description"', statements[0])
+        self.assertEqual(self.offer.get_dirty_fields(), [])
+        self.assertEqual(Offer.objects.get().title, "Renamed")
+
+    def test_save_keeps_concurrent_column_changes(self):
+        """
+        Ensure a save does not overwrite columns changed by others after the offer was loaded.
+        """
+        Offer.objects.filter(pk=self.offer.pk).update(image_derivatives={'thumbnail': 'offer-imgs/derivatives/t.png'})
+        self.offer.title = "Renamed"
+        self.offer.save()
+        self.assertEqual(Offer.objects.get().image_derivatives, {'thumbnail': 'offer-imgs/derivatives/t.png'})
+
+
+def make_image_upload(name="photo.png", size=(800, 600)):
+    """
+    Returns an uploaded PNG image of the given size.
+    """
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color='orange').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@override_settings(IMAGE_PIPELINE_EAGER=True, IMAGE_DERIVATIVES_WEBP=True)
+class OfferImageDerivativeTests(TestCase):
+    """
+    Test suite for the thumbnail and card-size derivatives rendered after an offer image upload.
+    """
+
+    def setUp(self):
+        """
+        Create a test user and an offer in a temporary media root.
+        """
+        self.enterContext(override_settings(MEDIA_ROOT=tempfile.mkdtemp()))
+        self.user = get_user_model().objects.create_user(username="testuser", password="testpassword")
+        self.offer = Offer.objects.create(title="Test Offer", description="Test Description", user=self.user)
+
+    def upload(self, image):
+        """
+        Saves the image on the offer and runs the derivative job queued for the commit.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.image = image
+            self.offer.save()
+        self.offer.refresh_from_db()
+        return self.offer.image_derivatives
+
+    def test_derivatives_rendered_after_upload(self):
+        """
+        Ensure thumbnail and card derivatives (plus WebP variants) are stored and exposed by the serializer.
+        """
+        derivatives = self.upload(make_image_upload())
+        self.assertEqual(set(derivatives), {'thumbnail', 'thumbnail_webp', 'card', 'card_webp'})
+        with default_storage.open(derivatives['thumbnail']) as thumbnail:
+            self.assertLessEqual(max(Image.open(thumbnail).size), 150)
+        with default_storage.open(derivatives['card']) as card:
+            self.assertEqual(Image.open(card).size, (533, 400))
+        data = OfferDetailViewSerializer(self.offer, context={'request': None}).data
+        self.assertEqual(data['image_derivatives']['card'], default_storage.url(derivatives['card']))
+
+    def test_derivatives_deleted_on_replace_and_delete(self):
+        """
+        Ensure the derivatives of a replaced image and of a deleted offer are removed from storage.
+        """
+        old_derivatives = self.upload(make_image_upload())
+        self.offer.image = make_image_upload("other.png", size=(300, 300))
+        self.offer.save()
+        self.assertEqual(self.offer.image_derivatives, {})
+        self.assertFalse(any(default_storage.exists(name) for name in old_derivatives.values()))
+        self.offer.refresh_from_db()
+        new_derivatives = self.upload(make_image_upload("third.png"))
+        self.offer.delete()
+        self.assertFalse(any(default_storage.exists(name) for name in new_derivatives.values()))
+
+    def test_stale_job_is_discarded(self):
+        """
+        Ensure derivatives of an upload that was replaced before the job ran are not stored.
+        """
+        self.upload(make_image_upload())
+        source_name = self.offer.image.name
+        Offer.objects.filter(pk=self.offer.pk).update(image='offer-imgs/replaced.png', image_derivatives={})
+        derivatives = generate_image_derivatives('offers_app.Offer', self.offer.pk, 'image', 'image_derivatives', source_name)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.image_derivatives, {})
+        self.assertFalse(any(default_storage.exists(name) for name in derivatives.values()))
@@ -1,4 +1,7 @@
+from unittest import mock
+
 from django.test import TestCase
+from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
 from rest_framework.exceptions import ValidationError
@@ -89,6 +92,19 @@ class OfferCreateSerializerTest(TestCase):
         self.assertTrue(serializer.is_valid())
         offer = serializer.save()
         self.assertEqual(offer.details.count(), 1)
+        offer.refresh_from_db()
+        self.assertEqual(offer.min_price, 50)
+        self.assertEqual(offer.min_delivery_time, 3)
+
+    def test_duplicate_offer_type(self):
+        """
+        Test that an offer_type can only be used once per offer
+        """
+        detail = {"title": "Basic Package", "revisions": 1, "delivery_time_in_days": 3, "price": 50, "features": [], "offer_type": "basic"}
+        data = {"title": "New Offer", "description": "This is a test offer", "details": [detail, {**detail, "price": 60}]}
+        serializer = OfferCreateSerializer(data=data, context={"request": self.request})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("details", serializer.errors)
 
     def test_invalid_image_extension(self):
         """
@@ -207,6 +223,20 @@ class OfferSerializerGetResponseTest(TestCase):
         serializer = OfferDetailViewSerializer(instance=self.offer, context={"request": self.request})
         self.assertEqual(len(details), 2)
 
+    def test_detail_urls_resolved_once_per_page(self):
+        """
+        Test that the detail URLs of a whole page are formatted from a single URL resolution
+        """
+        second_offer = Offer.objects.create(title="Second", description="List Test", user=self.user)
+        OfferDetail.objects.create(offer=second_offer, title="Basic", revisions=1, delivery_time_in_days=1, price=10, features=[], offer_type="basic")
+        offers = Offer.objects.prefetch_related('details').order_by('id')
+        with mock.patch('offers_app.api.serializers.reverse', wraps=reverse) as reverse_mock:
+            data = OfferListSerializer(offers, many=True, context={"request": self.request}).data
+        self.assertEqual(reverse_mock.call_count, 1)
+        detail = OfferDetail.objects.get(offer=second_offer)
+        expected_url = self.request.build_absolute_uri(reverse("offerdetails-detail", args=[detail.id]))
+        self.assertEqual(data[1]["details"], [{"id": detail.id, "url": expected_url}])
+
     def test_user_details_serialization(self):
         """
         Test that user_details are correctly serialized
@@ -1,9 +1,25 @@
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from unittest import mock, skipUnless
+import base64
+import csv
+import json
 
+from datetime import timedelta
+
+from django.utils import timezone
+
+from coderr_core.counters import BufferedCounter
+from ..api.views import OfferViewSet
+from ..changes import encode_cursor
+from ..counters import offer_view_counter
 from ..models import Offer, OfferDetail
+from ..search import search_index_available
 
 
 class OfferViewSetListActionTest(APITestCase):
@@ -39,6 +55,19 @@ class OfferViewSetListActionTest(APITestCase):
         response = self.client.get(self.url, {'max_delivery_time': 3})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_offer_list_filter_uses_detail_summary(self):
+        """
+        Test that price and delivery time filters match against the cheapest and fastest detail of an offer.
+        """
+        response = self.client.get(self.url, {'min_price': 60})
+        self.assertEqual(response.data['count'], 0)
+        response = self.client.get(self.url, {'min_price': 50, 'max_delivery_time': 2})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['min_price'], 50)
+        self.assertEqual(response.data['results'][0]['min_delivery_time'], 2)
+        response = self.client.get(self.url, {'max_delivery_time': 1})
+        self.assertEqual(response.data['count'], 0)
+
     def test_offer_list_search(self):
         """
         Test that searching by title or description works.
@@ -65,6 +94,843 @@ class OfferViewSetListActionTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class OfferListQueryCountTest(APITestCase):
+    """
+    Test suite pinning the number of queries needed to render a page of the offer list.
+    """
+    QUERY_BUDGET = 3  # COUNT, page of offers joined with their owners, prefetched details
+
+    def setUp(self):
+        self.url = reverse('offer-list')
+        for user_index in range(5):
+            user = get_user_model().objects.create(username=f"business{user_index}", type="business")
+            for offer_index in range(12):
+                offer = Offer.objects.create(title=f"Offer {offer_index}", description="Query Test", user=user)
+                OfferDetail.objects.bulk_create([
+                    OfferDetail(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=days, price=price, offer_type=offer_type)
+                    for offer_type, days, price in [("basic", 7, 50), ("standard", 5, 100), ("premium", 3, 200)]
+                ])
+        Offer.objects.all().update_detail_summary()
+
+    def test_list_query_count_is_independent_of_page_size(self):
+        """
+        Test that a page renders in a fixed number of queries for small and maximum page sizes.
+        """
+        for page_size in [1, 6, 50]:
+            with self.assertNumQueries(self.QUERY_BUDGET):
+                response = self.client.get(self.url, {'page_size': page_size})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), page_size)
+            self.assertEqual(len(response.data['results'][0]['details']), 3)
+
+    def test_list_query_count_with_filters_and_ordering(self):
+        """
+        Test that filtering, searching and ordering do not add queries per offer.
+        """
+        params = {'page_size': 50, 'min_price': 10, 'max_delivery_time': 5, 'search': 'Offer', 'ordering': '-min_price'}
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 50)
+
+
+class OfferSparseFieldsetTest(APITestCase):
+    """
+    Test suite for the `fields` and `expand` query parameters of the offer list and retrieve.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        for index in range(3):
+            self.offer = Offer.objects.create(title=f"Offer {index}", description="Fieldset Test", user=self.user)
+            for offer_type, price in [("basic", 50), ("premium", 150)]:
+                OfferDetail.objects.create(offer=self.offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=price, features=["Logo"], offer_type=offer_type)
+        self.url = reverse('offer-list')
+
+    def test_list_projection_skips_join_prefetch_and_columns(self):
+        """
+        Test that a projection to ids and titles loads neither owners, details nor unrequested columns.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0], {'id': Offer.objects.order_by('updated_at').first().id, 'title': "Offer 0"})
+        self.assertEqual(len(queries), 2)  # COUNT and the page of offers
+        page_sql = queries[1]['sql']
+        self.assertNotIn('JOIN', page_sql)
+        self.assertNotIn('"description"', page_sql)
+
+    def test_list_fields_keep_requested_method_fields(self):
+        """
+        Test that requested method fields are still rendered with their join or prefetch.
+        """
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'fields': 'id,user_details,details'})
+        result = response.data['results'][0]
+        self.assertEqual(set(result), {'id', 'user_details', 'details'})
+        self.assertEqual(result['user_details']['username'], "testuser")
+        self.assertEqual(len(result['details']), 2)
+
+    def test_expand_details(self):
+        """
+        Test that `expand=details` renders the complete detail objects instead of their links.
+        """
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'fields': 'id,details', 'expand': 'details'})
+        detail = response.data['results'][0]['details'][0]
+        self.assertEqual(detail['price'], '50.00')
+        self.assertEqual(detail['features'], ["Logo"])
+
+    def test_retrieve_fieldset_has_own_etag(self):
+        """
+        Test that the retrieve honours `fields` and that fieldsets are cached and validated separately.
+        """
+        self.client.force_authenticate(user=self.user)
+        url = reverse('offer-detail', kwargs={'pk': self.offer.id})
+        full = self.client.get(url)
+        sparse = self.client.get(url, {'fields': 'id,title'})
+        self.assertEqual(sparse.data, {'id': self.offer.id, 'title': "Offer 2"})
+        self.assertEqual(sparse['X-Cache'], 'MISS')
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+        response = self.client.get(url, {'fields': 'title,id'}, HTTP_IF_NONE_MATCH=sparse['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+@skipUnless(connection.vendor == 'sqlite', "The query plans are asserted in SQLite's EXPLAIN QUERY PLAN format.")
+class OfferFilterQueryPlanTest(APITestCase):
+    """
+    Test suite asserting that the price and delivery time filters produce index-friendly SQL.
+    """
+    def get_list_queryset(self, params):
+        view = OfferViewSet(action_map={'get': 'list'}, format_kwarg=None)
+        view.request = view.initialize_request(APIRequestFactory().get(reverse('offer-list'), params))
+        return view.filter_queryset(view.get_queryset())
+
+    def test_filters_use_summary_indexes_without_distinct(self):
+        """
+        Test that the filters are applied once as column predicates that are searched via an index,
+        without joins on the details, GROUP BY or DISTINCT.
+        """
+        queryset = self.get_list_queryset({'min_price': 100, 'max_delivery_time': 7, 'ordering': 'min_price'})
+        sql = str(queryset.query)
+        self.assertEqual(sql.count('"offers_app_offer"."min_price" >='), 1)
+        self.assertEqual(sql.count('"offers_app_offer"."min_delivery_time" <='), 1)
+        for fragment in ('offers_app_offerdetail', 'GROUP BY', 'DISTINCT'):
+            self.assertNotIn(fragment, sql)
+        plan = queryset.explain()
+        self.assertIn('SEARCH offers_app_offer USING INDEX offers_app_offer_min_price', plan)
+        self.assertNotIn('SCAN offers_app_offer', plan)
+        for temp_b_tree in ('FOR DISTINCT', 'FOR GROUP BY', 'FOR ORDER BY'):
+            self.assertNotIn(temp_b_tree, plan)
+
+    def test_default_ordering_uses_index(self):
+        """
+        Test that the default `updated_at` ordering is read from its index instead of sorting the catalog.
+        """
+        plan = self.get_list_queryset({}).explain()
+        self.assertIn('USING INDEX offer_updated_at_id_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_offer_type_lookups_use_unique_index(self):
+        """
+        Test that the (offer, offer_type) lookups of updates and facets are answered by the unique constraint's index.
+        """
+        plan = OfferDetail.objects.filter(offer_id=1, offer_type='basic').explain()
+        self.assertIn('USING INDEX', plan)
+        self.assertIn('(offer_id=? AND offer_type=?)', plan)
+
+    def test_summary_aggregates_use_covering_indexes(self):
+        """
+        Test that the per-offer MIN/MAX lookups of the summary refresh are answered from the composite indexes.
+        """
+        for column, index in (('price', 'offerdetail_offer_price_idx'), ('delivery_time_in_days', 'offerdetail_offer_delivery_idx')):
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN SELECT MIN({column}) FROM offers_app_offerdetail WHERE offer_id = %s", [1])
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            self.assertIn(f'USING COVERING INDEX {index}', plan)
+
+
+class OfferKeysetPaginationTest(APITestCase):
+    """
+    Test suite for the opt-in cursor pagination mode of the offer list.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.url = reverse('offer-list')
+        for index, price in enumerate([300, 100, 200, 100, 100, None, 50]):
+            offer = Offer.objects.create(title=f"Offer {index}", description="Cursor Test", user=self.user)
+            if price is not None:
+                OfferDetail.objects.create(offer=offer, title="Basic", revisions=1, delivery_time_in_days=3, price=price, offer_type="basic")
+
+    def collect_pages(self, params):
+        """
+        Follows the `next` links and returns the offer ids of all pages.
+        """
+        ids = []
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2, **params})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(offer['id'] for offer in response.data['results'])
+            if response.data['next'] is None:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_cursor_pages_follow_ordering(self):
+        """
+        Test that walking all pages yields every offer exactly once in the requested order.
+        """
+        for ordering in ['updated_at', '-updated_at', 'min_price', '-min_price']:
+            expected = list(Offer.objects.order_by(ordering, '-id' if ordering.startswith('-') else 'id').values_list('id', flat=True))
+            self.assertEqual(self.collect_pages({'ordering': ordering}), expected)
+
+    def test_cursor_page_without_count_query(self):
+        """
+        Test that a cursor page is fetched without a COUNT query.
+        """
+        with self.assertNumQueries(2):  # page of offers, prefetched details
+            response = self.client.get(self.url, {'pagination': 'cursor', 'ordering': 'min_price'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 6)
+
+    def test_invalid_cursor(self):
+        """
+        Test that a malformed cursor and a cursor of another ordering return 404.
+        """
+        response = self.client.get(self.url, {'pagination': 'cursor', 'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2, 'ordering': 'min_price'})
+        response = self.client.get(response.data['next'].replace('ordering=min_price', 'ordering=updated_at'))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_stays_default(self):
+        """
+        Test that the page-number response shape is still returned without the opt-in parameter.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 7)
+        self.assertIn('previous', response.data)
+
+
+class OfferFullTextSearchTest(APITestCase):
+    """
+    Test suite for the full-text search of the offer list served from the FTS5 index.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.url = reverse('offer-list')
+        self.logo = Offer.objects.create(title="Logo Design", description="Logo and logo variants for your brand", user=self.user)
+        self.website = Offer.objects.create(title="Website Development", description="Responsive websites with a logo", user=self.user)
+        self.app = Offer.objects.create(title="Mobile App", description="Native apps", user=self.user)
+        OfferDetail.objects.create(offer=self.app, title="Basic", revisions=1, delivery_time_in_days=3, price=50, features=["Push Notifications"], offer_type="basic")
+
+    def search(self, term, **params):
+        response = self.client.get(self.url, {'search': term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [offer['id'] for offer in response.data['results']]
+
+    def test_search_matches_title_description_and_details(self):
+        """
+        Test that title, description and detail features are searchable, including word prefixes.
+        """
+        self.assertEqual(self.search("website"), [self.website.id])
+        self.assertEqual(self.search("respons"), [self.website.id])
+        self.assertEqual(self.search("push notif"), [self.app.id])
+        self.assertEqual(self.search("nothing"), [])
+
+    def test_search_ranked_by_relevance(self):
+        """
+        Test that results are ordered by relevance unless an explicit ordering is requested.
+        """
+        self.assertEqual(self.search("logo"), [self.logo.id, self.website.id])
+        self.assertEqual(self.search("logo", ordering='-updated_at'), [self.website.id, self.logo.id])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """
+        Test that the index is updated when offers change or are deleted.
+        """
+        self.app.title = "Mobile Game"
+        self.app.save()
+        self.assertEqual(self.search("game"), [self.app.id])
+        self.app.delete()
+        self.assertEqual(self.search("game"), [])
+
+    def test_search_index_follows_created_offers(self):
+        """
+        Test that offers created with details through the API are searchable by their features.
+        """
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'title': 'Branding', 'description': 'Corporate identity',
+            'details': [{"title": "Basic", "revisions": 1, "delivery_time_in_days": 3, "price": 50, "features": ["Visitenkarte"], "offer_type": "basic"}]
+        }
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(self.search("visitenkarte"), [response.data['id']])
+
+    def test_search_without_words_falls_back(self):
+        """
+        Test that a search term without any words falls back to substring matching.
+        """
+        self.assertEqual(self.search("+++"), [])
+
+
+class OfferResponseCacheTest(APITestCase):
+    """
+    Test suite for the versioned response cache of the offer list and retrieve endpoints.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.admin_user = get_user_model().objects.create_superuser(username="adminuser", password="password")
+        self.offer = Offer.objects.create(title="Cached offer", description="Cache Test", user=self.user)
+        self.detail = OfferDetail.objects.create(offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=3, price=50, features=[], offer_type="basic")
+        self.url = reverse('offer-list')
+        self.detail_url = reverse('offer-detail', kwargs={'pk': self.offer.id})
+
+    def test_list_served_from_cache(self):
+        """
+        Test that repeated list requests with equivalent parameters are served without queries.
+        """
+        response = self.client.get(self.url, {'ordering': 'min_price', 'page_size': 6})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'page_size': 6, 'ordering': 'min_price', 'unrelated': 'x'})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['results'][0]['title'], "Cached offer")
+        response = self.client.get(self.url, {'ordering': '-min_price', 'page_size': 6})
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_list_invalidated_by_offer_and_detail_changes(self):
+        """
+        Test that saving an offer or one of its details invalidates cached list pages.
+        """
+        self.client.get(self.url)
+        self.offer.title = "Renamed offer"
+        self.offer.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], "Renamed offer")
+        self.detail.price = 20
+        self.detail.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['min_price'], 20)
+
+    def test_retrieve_cached_per_offer(self):
+        """
+        Test that retrieve responses are cached per offer and invalidated by deletes.
+        """
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(self.detail_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.detail_url)['X-Cache'], 'HIT')
+        self.detail.delete()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['details'], [])
+
+    def test_retrieve_cache_respects_permissions(self):
+        """
+        Test that a cached retrieve response is not served to unauthenticated users.
+        """
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.detail_url)
+        self.client.logout()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_stats(self):
+        """
+        Test that hit and miss counters are exposed to admin users only.
+        """
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('offer-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse('offer-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['hits'], 1)
+        self.assertEqual(response.data['misses'], 1)
+
+
+class OfferConditionalGetTest(APITestCase):
+    """
+    Test suite for the ETag and Last-Modified validators of the offer and offer detail endpoints.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.offer = Offer.objects.create(title="Polled offer", description="ETag Test", user=self.user)
+        self.detail = OfferDetail.objects.create(offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=3, price=50, features=[], offer_type="basic")
+        self.url = reverse('offer-list')
+        self.detail_url = reverse('offer-detail', kwargs={'pk': self.offer.id})
+        self.offerdetail_url = reverse('offerdetails-detail', kwargs={'pk': self.detail.id})
+        self.client.force_authenticate(user=self.user)
+
+    def test_retrieve_not_modified(self):
+        """
+        Test that a matching If-None-Match is answered with 304 on cache misses and hits.
+        """
+        response = self.client.get(self.detail_url)
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_retrieve_if_modified_since(self):
+        """
+        Test that If-Modified-Since with the returned Last-Modified date is answered with 304.
+        """
+        response = self.client.get(self.detail_url)
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_change_changes_etags(self):
+        """
+        Test that changing an offer detail changes the validators of the offer and of the offer detail.
+        """
+        offer_etag = self.client.get(self.detail_url)['ETag']
+        detail_etag = self.client.get(self.offerdetail_url)['ETag']
+        self.detail.price = 20
+        self.detail.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=offer_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['min_price'], 20)
+        response = self.client.get(self.offerdetail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['price'], '20.00')
+        response = self.client.get(self.offerdetail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_weak_etag(self):
+        """
+        Test that list pages carry a weak ETag that is answered without queries and changes with the catalog.
+        """
+        response = self.client.get(self.url, {'page_size': 6})
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'page_size': 6}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.client.get(self.url, {'page_size': 7})['ETag'], etag)
+        self.offer.title = "Renamed offer"
+        self.offer.save()
+        response = self.client.get(self.url, {'page_size': 6}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class OfferFacetsTest(APITestCase):
+    """
+    Test suite for the facet counts of the offer filter sidebar.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.other_user = get_user_model().objects.create_user(username="otheruser", password="password", type="business")
+        for title, user, details in [
+            ("Logo design", self.user, [(30, 2, "basic"), (80, 5, "premium")]),
+            ("Website design", self.user, [(120, 10, "basic"), (300, 20, "standard")]),
+            ("Logo animation", self.other_user, [(600, 40, "premium")]),
+        ]:
+            offer = Offer.objects.create(title=title, description="Facet Test", user=user)
+            for price, days, offer_type in details:
+                OfferDetail.objects.create(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=days, price=price, features=[], offer_type=offer_type)
+        Offer.objects.create(title="Empty offer", description="Facet Test", user=self.user)
+        self.url = reverse('offer-facets')
+
+    def bucket_counts(self, buckets):
+        return [bucket['count'] for bucket in buckets]
+
+    def test_facet_counts(self):
+        """
+        Test that price, delivery time and offer type counts are computed with a single query.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(response.data['min_price'][0], {'gte': 0, 'lt': 50, 'count': 1})
+        self.assertEqual(self.bucket_counts(response.data['min_price']), [1, 0, 1, 0, 1, 0])
+        self.assertEqual(response.data['delivery_time'][-1], {'gt': 30, 'lte': None, 'count': 1})
+        self.assertEqual(self.bucket_counts(response.data['delivery_time']), [0, 1, 0, 1, 0, 1])
+        self.assertEqual(response.data['offer_type'], {'basic': 2, 'standard': 1, 'premium': 2})
+
+    def test_facets_apply_filters_and_search(self):
+        """
+        Test that the list's filter and search parameters narrow the counted offers.
+        """
+        response = self.client.get(self.url, {'creator_id': self.other_user.id})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['offer_type'], {'basic': 0, 'standard': 0, 'premium': 1})
+        response = self.client.get(self.url, {'search': 'logo'})
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(self.bucket_counts(response.data['min_price']), [1, 0, 0, 0, 1, 0])
+
+    def test_facets_cached_and_invalidated(self):
+        """
+        Test that facet responses are cached until an offer changes.
+        """
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+        OfferDetail.objects.create(offer=Offer.objects.get(title="Empty offer"), title="basic", revisions=1, delivery_time_in_days=1, price=10, features=[], offer_type="basic")
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['offer_type']['basic'], 3)
+
+
+class OfferFeatureFilterTest(APITestCase):
+    """
+    Test suite for the `features` filter and the feature autocomplete served from the feature index.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.offers = {}
+        for title, features in [
+            ("Logo", [["Logo Design", "Favicon"], ["Logo Design", "Source Files"]]),
+            ("Website", [["Responsive", "Logo Design"]]),
+            ("Branding", [["Branding", "Responsive"]]),
+        ]:
+            offer = self.offers[title] = Offer.objects.create(title=title, description="Feature Test", user=self.user)
+            for feature_list, offer_type in zip(features, ["basic", "premium"]):
+                OfferDetail.objects.create(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=50, features=feature_list, offer_type=offer_type)
+        self.url = reverse('offer-list')
+
+    def titles(self, params):
+        response = self.client.get(self.url, {**params, 'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(offer['title'] for offer in response.data['results'])
+
+    def test_filter_features_and_or(self):
+        """
+        Test that comma-separated features must all match while `|` alternatives may match any,
+        case- and whitespace-insensitively.
+        """
+        self.assertEqual(self.titles({'features': 'logo  DESIGN'}), ["Logo", "Website"])
+        self.assertEqual(self.titles({'features': 'logo design,responsive'}), ["Website"])
+        self.assertEqual(self.titles({'features': 'favicon|branding'}), ["Branding", "Logo"])
+        self.assertEqual(self.titles({'features': 'favicon|branding,responsive'}), ["Branding"])
+        self.assertEqual(self.titles({'features': 'unknown'}), [])
+
+    def test_filter_follows_detail_changes(self):
+        """
+        Test that the index is updated when a detail's features are changed.
+        """
+        detail = OfferDetail.objects.get(offer=self.offers["Branding"])
+        detail.features = ["Print Ready"]
+        detail.save()
+        self.assertEqual(self.titles({'features': 'branding'}), [])
+        self.assertEqual(self.titles({'features': 'print ready'}), ["Branding"])
+
+    def test_feature_autocomplete(self):
+        """
+        Test that feature suggestions match the prefix and are ordered by the number of offers providing them.
+        """
+        response = self.client.get(reverse('offer-feature-autocomplete'), {'q': 'Lo'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'token': 'logo design', 'name': 'Logo Design', 'count': 2}])
+        response = self.client.get(reverse('offer-feature-autocomplete'), {'limit': 2})
+        self.assertEqual([feature['token'] for feature in response.data], ['logo design', 'responsive'])
+        response = self.client.get(reverse('offer-feature-autocomplete'), {'limit': 'many'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OfferExportTest(APITestCase):
+    """
+    Test suite for the streaming NDJSON / CSV export of the offer catalog.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.other_user = get_user_model().objects.create_user(username="otheruser", password="password", type="business")
+        for index in range(5):
+            offer = Offer.objects.create(title=f"Offer {index}", description="Export Test", user=self.user)
+            for offer_type, price in [("basic", 50 + index), ("premium", 150 + index)]:
+                OfferDetail.objects.create(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=price, features=["Logo, vector"], offer_type=offer_type)
+        Offer.objects.create(title="Other", description="Export Test", user=self.other_user)
+        self.url = reverse('offer-export')
+        self.client.force_authenticate(user=self.user)
+
+    def read_lines(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8').splitlines()
+
+    def test_export_ndjson(self):
+        """
+        Test that every offer is exported as one JSON line with its nested details.
+        """
+        response = self.client.get(self.url, {'ordering': '-min_price'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in self.read_lines(response)]
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[0]['title'], "Offer 4")
+        self.assertEqual(records[0]['user'], self.user.id)
+        self.assertEqual([detail['price'] for detail in records[0]['details']], [54, 154])
+        self.assertEqual(records[-1]['details'], [])
+        self.assertEqual(records[0]['details'][0]['features'], ["Logo, vector"])
+
+    def test_export_csv_with_filters(self):
+        """
+        Test that the CSV export has one row per detail and applies the list filters.
+        """
+        response = self.client.get(self.url, {'output': 'csv', 'creator_id': self.user.id, 'min_price': 53})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('offers.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(self.read_lines(response)))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row['title'] for row in rows}, {"Offer 3", "Offer 4"})
+        self.assertEqual(json.loads(rows[0]['detail_features']), ["Logo, vector"])
+
+    def test_export_reads_offers_in_chunks(self):
+        """
+        Test that the offers are fetched in chunks, with one detail query per chunk instead of per offer.
+        """
+        with self.settings(OFFER_EXPORT_CHUNK_SIZE=2):
+            response = self.client.get(self.url)
+            with self.assertNumQueries(1 + 3):
+                lines = self.read_lines(response)
+        self.assertEqual(len(lines), 6)
+
+    def test_export_requires_authentication_and_valid_format(self):
+        """
+        Test that anonymous exports and unknown formats are rejected.
+        """
+        self.assertEqual(self.client.get(self.url, {'output': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class OfferViewCounterTest(APITestCase):
+    """
+    Test suite for the buffered offer view counter and the `views` ordering.
+    """
+    def setUp(self):
+        cache.clear()
+        offer_view_counter.flush()  # drop the views counted by other tests before any offer exists
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.offers = [Offer.objects.create(title=f"Offer {index}", description="View Test", user=self.user) for index in range(3)]
+        self.client.force_authenticate(user=self.user)
+
+    def retrieve(self, offer_id):
+        return self.client.get(reverse('offer-detail', kwargs={'pk': offer_id}))
+
+    def test_views_are_buffered_and_flushed_in_one_update(self):
+        """
+        Test that retrieves, including cache hits, only count in memory until the flush writes all deltas at once.
+        """
+        first, second = self.offers[0].id, self.offers[1].id
+        responses = [self.retrieve(first) for _ in range(3)] + [self.retrieve(second), self.retrieve(9999)]
+        self.assertEqual([response['X-Cache'] for response in responses[:3]], ['MISS', 'HIT', 'HIT'])
+        self.assertEqual(offer_view_counter.pending(), {first: 3, second: 1})
+        self.assertEqual(Offer.objects.get(pk=first).views, 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(offer_view_counter.flush(), 2)
+        self.assertEqual(offer_view_counter.pending(), {})
+        self.assertEqual(dict(Offer.objects.values_list('id', 'views')), {first: 3, second: 1, self.offers[2].id: 0})
+
+    def test_full_buffer_flushes_synchronously(self):
+        """
+        Test that the buffer is written as soon as it holds `max_pending` rows.
+        """
+        counter = BufferedCounter('offers_app.Offer', 'views', max_pending=2)
+        counter.increment(self.offers[0].id)
+        self.assertEqual(counter.pending(), {self.offers[0].id: 1})
+        counter.increment(self.offers[1].id, amount=4)
+        self.assertEqual(counter.pending(), {})
+        self.assertEqual(Offer.objects.get(pk=self.offers[1].id).views, 4)
+
+    def test_failed_flush_of_full_buffer_does_not_raise(self):
+        """
+        Test that a failing flush of a full buffer does not fail the retrieve and keeps the counts.
+        """
+        offer_id = self.offers[0].id
+        with mock.patch.object(offer_view_counter, 'max_pending', 1), \
+                mock.patch.object(offer_view_counter, 'apply', side_effect=DatabaseError), \
+                self.assertLogs('coderr_core.counters', level='ERROR'):
+            response = self.retrieve(offer_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(offer_view_counter.pending(), {offer_id: 1})
+        offer_view_counter.flush()
+        self.assertEqual(Offer.objects.get(pk=offer_id).views, 1)
+
+    def test_full_buffer_wakes_up_running_flusher(self):
+        """
+        Test that a full buffer is handed to the running background flusher instead of the calling thread.
+        """
+        counter = BufferedCounter('offers_app.Offer', 'views', max_pending=1)
+        counter._thread = mock.Mock(is_alive=mock.Mock(return_value=True))
+        with mock.patch.object(counter, 'flush') as flush:
+            counter.increment(self.offers[0].id)
+        flush.assert_not_called()
+        self.assertTrue(counter._wakeup.is_set())
+
+    def test_failed_flush_keeps_deltas(self):
+        """
+        Test that the deltas of a failed flush are retried with the next one.
+        """
+        counter = BufferedCounter('offers_app.Offer', 'views')
+        counter.increment(self.offers[0].id, amount=2)
+        with mock.patch.object(counter, 'apply', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                counter.flush()
+        counter.increment(self.offers[0].id)
+        counter.flush()
+        self.assertEqual(Offer.objects.get(pk=self.offers[0].id).views, 3)
+
+    def test_ordering_by_views(self):
+        """
+        Test that the list can be ordered by views, also with keyset pagination.
+        """
+        for offer, views in zip(self.offers, [5, 20, 1]):
+            Offer.objects.filter(pk=offer.pk).update(views=views)
+        response = self.client.get(reverse('offer-list'), {'ordering': '-views'})
+        self.assertEqual([offer['title'] for offer in response.data['results']], ["Offer 1", "Offer 0", "Offer 2"])
+        response = self.client.get(reverse('offer-list'), {'ordering': '-views', 'pagination': 'cursor', 'page_size': 2})
+        response = self.client.get(response.data['next'])
+        self.assertEqual([offer['title'] for offer in response.data['results']], ["Offer 2"])
+
+
+class OfferChangesFeedTest(APITestCase):
+    """
+    Test suite for the delta-sync feed of created, updated and deleted offers.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.offers = []
+        for index in range(3):
+            offer = Offer.objects.create(title=f"Offer {index}", description="Sync Test", user=self.user)
+            OfferDetail.objects.create(offer=offer, title="basic", revisions=1, delivery_time_in_days=3, price=50, features=[], offer_type="basic")
+            self.offers.append(offer)
+        self.url = reverse('offer-changes')
+
+    def changes(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(change['type'], change['id']) for change in response.data['changes']]
+
+    def test_incremental_sync(self):
+        """
+        Test that a full sync is followed by only the changes since its cursor, in the order they happened.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(self.changes(response), [('created', offer.id) for offer in self.offers])
+        self.assertEqual(response.data['changes'][0]['offer']['title'], "Offer 0")
+        self.assertFalse(response.data['has_more'])
+
+        first, second = self.offers[0], self.offers[1]
+        first.title = "Renamed"
+        first.save()
+        second_id = second.id
+        second.delete()
+        new_offer = Offer.objects.create(title="New", description="Sync Test", user=self.user)
+        with self.assertNumQueries(3):  # offers with owners, their details, tombstones
+            response = self.client.get(self.url, {'since': response.data['next']})
+        self.assertEqual(self.changes(response), [('updated', first.id), ('deleted', second_id), ('created', new_offer.id)])
+        self.assertEqual(response.data['changes'][0]['offer']['title'], "Renamed")
+        self.assertIsNone(response.data['changes'][1]['offer'])
+
+        since = response.data['next']
+        response = self.client.get(self.url, {'since': since})
+        self.assertEqual(self.changes(response), [])
+        self.assertEqual(response.data['next'], since)
+
+    def test_limit_and_continuation(self):
+        """
+        Test that a limited feed is continued with its cursor without gaps or repetitions.
+        """
+        deleted_id = self.offers[2].id
+        self.offers[2].delete()
+        seen, since = [], None
+        while True:
+            response = self.client.get(self.url, {'limit': 1, **({'since': since} if since else {})})
+            seen += self.changes(response)
+            since = response.data['next']
+            if not response.data['has_more']:
+                break
+        self.assertEqual(seen, [('created', self.offers[0].id), ('created', self.offers[1].id), ('deleted', deleted_id)])
+
+    def test_invalid_and_expired_cursors(self):
+        """
+        Test that an undecodable cursor is rejected and one older than the tombstone retention requires a resync.
+        """
+        self.assertEqual(self.client.get(self.url, {'since': 'not-a-cursor'}).status_code, status.HTTP_400_BAD_REQUEST)
+        expired = encode_cursor((timezone.now() - timedelta(days=31), 0, 1))
+        self.assertEqual(self.client.get(self.url, {'since': expired}).status_code, status.HTTP_410_GONE)
+        naive = base64.urlsafe_b64encode(json.dumps({'t': '2026-10-17T00:00:00', 'k': 0, 'pk': 1}).encode()).decode()
+        self.assertEqual(self.client.get(self.url, {'since': naive}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OfferBulkImportTest(APITestCase):
+    """
+    Test suite for the NDJSON bulk import endpoint of the OfferViewSet.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.customer_user = get_user_model().objects.create_user(username="customer", password="password", type="customer")
+        self.url = reverse('offer-bulk-import')
+        self.client.force_authenticate(user=self.user)
+
+    def offer_line(self, title, prices=(50, 100, 200)):
+        return json.dumps({
+            'title': title, 'description': 'Imported',
+            'details': [
+                {"title": offer_type, "revisions": 1, "delivery_time_in_days": 7 - index, "price": price, "features": ["Import"], "offer_type": offer_type}
+                for index, (offer_type, price) in enumerate(zip(["basic", "standard", "premium"], prices))
+            ]
+        })
+
+    def post_lines(self, lines):
+        return self.client.generic('POST', self.url, '\n'.join(lines).encode('utf-8'), content_type='application/x-ndjson')
+
+    def test_import_creates_offers_and_reports_invalid_lines(self):
+        """
+        Test that valid lines are imported and invalid lines are reported with their line numbers.
+        """
+        lines = [self.offer_line("First"), '{invalid json', self.offer_line("Second"), '', json.dumps({'title': 'No details'}), self.offer_line("Third")]
+        response = self.post_lines(lines)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['failed'], 2)
+        self.assertEqual([error['line'] for error in response.data['errors']], [2, 5])
+        self.assertIn('details', response.data['errors'][1]['errors'])
+        self.assertEqual(Offer.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(OfferDetail.objects.count(), 9)
+
+    def test_imported_offers_are_listed_and_searchable(self):
+        """
+        Test that imported offers get their summary columns and search index entries.
+        """
+        self.post_lines([self.offer_line("Imported Logo", prices=(30, 60, 90))])
+        response = self.client.get(reverse('offer-list'), {'search': 'imported logo'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['min_price'], 30)
+        self.assertEqual(response.data['results'][0]['min_delivery_time'], 5)
+
+    def test_import_only_invalid_lines(self):
+        """
+        Test that a body without any valid line returns 400.
+        """
+        response = self.post_lines(['[]'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['failed'], 1)
+
+    def test_customer_cannot_import(self):
+        """
+        Test that customer users cannot import offers.
+        """
+        self.client.force_authenticate(user=self.customer_user)
+        response = self.post_lines([self.offer_line("First")])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class OfferViewSetCreateActionTest(APITestCase):
     """
     Test suite for the create action of the OfferViewSet, ensuring that only authenticated business users
@@ -225,6 +1091,88 @@ class OfferViewSetUpdateActionTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
 
+class OfferBatchedDetailUpdateTest(APITestCase):
+    """
+    Test suite for updating an offer together with its details in one batched transaction.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.offer = Offer.objects.create(title="Test offer", description="Update Test", user=self.user)
+        for offer_type, days, price in [("basic", 7, 50), ("standard", 5, 100), ("premium", 3, 200)]:
+            OfferDetail.objects.create(offer=self.offer, title=offer_type, revisions=1, delivery_time_in_days=days, price=price, offer_type=offer_type)
+        self.url = reverse('offer-detail', kwargs={'pk': self.offer.id})
+        self.client.force_authenticate(user=self.user)
+        self.data = {
+            'title': 'Updated offer',
+            'details': [
+                {"title": "Basic+", "revisions": 2, "delivery_time_in_days": 6, "price": 40, "features": ["A"], "offer_type": "basic"},
+                {"title": "Standard+", "revisions": 3, "delivery_time_in_days": 4, "price": 90, "features": ["B"], "offer_type": "standard"},
+                {"title": "Premium+", "revisions": -1, "delivery_time_in_days": 2, "price": 190, "features": ["C"], "offer_type": "premium"},
+            ]
+        }
+
+    def test_update_all_details_in_constant_queries(self):
+        """
+        Test that the details are loaded, written and rendered without per-detail queries.
+        The changed features add the three statements of the feature index refresh; the search index
+        is rebuilt once for the offer and its details.
+        """
+        with self.assertNumQueries(13), CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        if search_index_available():
+            self.assertEqual(sum('INSERT INTO offers_app_offer_fts' in query['sql'] for query in queries), 1)
+        self.assertEqual(sorted(detail['price'] for detail in response.data['details']), ['190.00', '40.00', '90.00'])
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual(offer.title, 'Updated offer')
+        self.assertEqual(offer.min_price, 40)
+        self.assertEqual(offer.min_delivery_time, 2)
+        self.assertEqual(OfferDetail.objects.get(offer=offer, offer_type="premium").revisions, -1)
+        response = self.client.get(reverse('offer-list'), {'search': 'Premium+'})
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.offer.pk])
+
+    def test_partial_detail_update_keeps_other_fields(self):
+        """
+        Test that a detail patch only changes the submitted fields.
+        """
+        data = {'details': [{"offer_type": "standard", "price": 80}]}
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        detail = OfferDetail.objects.get(offer=self.offer, offer_type="standard")
+        self.assertEqual(detail.price, 80)
+        self.assertEqual(detail.title, "standard")
+        self.assertEqual(detail.delivery_time_in_days, 5)
+
+    def test_detail_update_without_features_skips_feature_index(self):
+        """
+        Test that the feature index is only refreshed when the features of a detail are written.
+        """
+        for detail in self.data['details']:
+            del detail['features']
+        with self.assertNumQueries(10):
+            response = self.client.patch(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_detail_rolls_back_update(self):
+        """
+        Test that the offer and its details stay unchanged if one detail is invalid.
+        """
+        self.data['details'][2]['revisions'] = -5
+        response = self.client.patch(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Offer.objects.get(pk=self.offer.pk).title, "Test offer")
+        self.assertEqual(OfferDetail.objects.get(offer=self.offer, offer_type="basic").price, 50)
+
+    def test_unknown_offer_type(self):
+        """
+        Test that a detail with an offer type the offer does not have is rejected.
+        """
+        OfferDetail.objects.filter(offer=self.offer, offer_type="premium").delete()
+        response = self.client.patch(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('details', response.data)
+
+
 class OfferDetailDetailViewTest(APITestCase):
     """
     Test suite for retrieving a specific offer detail, ensuring proper access for authenticated users, admins, 
@@ -268,4 +1216,75 @@ class OfferDetailDetailViewTest(APITestCase):
         self.client.force_authenticate(user=self.admin_user)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['id'], self.offer.id)
\ No newline at end of file
+        self.assertEqual(response.data['id'], self.offer.id)
+
+
+class OfferDetailBatchViewTest(APITestCase):
+    """
+    Test suite for retrieving several offer details by id with one request.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="password", type="business")
+        self.offer = Offer.objects.create(title="Test offer", description="Batch Test", user=self.user)
+        self.details = [
+            OfferDetail.objects.create(offer=self.offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=price, features=[], offer_type=offer_type)
+            for offer_type, price in [("basic", 50), ("standard", 100), ("premium", 200)]
+        ]
+        self.url = reverse('offerdetails-list')
+        self.client.force_authenticate(user=self.user)
+
+    def ids(self, *details):
+        return ','.join(str(detail.id) for detail in details)
+
+    def test_batch_in_requested_order_with_one_query(self):
+        """
+        Test that the details are returned in the requested order with the single-detail format,
+        skipping unknown and duplicate ids.
+        """
+        premium, basic = self.details[2], self.details[0]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'ids': f"{premium.id},9999,{basic.id},{premium.id}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([detail['id'] for detail in response.data], [premium.id, basic.id])
+        single = self.client.get(reverse('offerdetails-detail', kwargs={'pk': premium.id}))
+        self.assertEqual(response.data[0], single.data)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_batch_conditional_get(self):
+        """
+        Test that an unchanged batch is answered with 304 and a changed detail yields a new ETag.
+        """
+        params = {'ids': self.ids(*self.details)}
+        etag = self.client.get(self.url, params)['ETag']
+        self.assertEqual(self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.client.get(self.url, {'ids': self.ids(*self.details[:2])})['ETag'], etag)
+        self.details[1].price = 120
+        self.details[1].save()
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_batch_with_removed_detail_is_not_modified_by_date(self):
+        """
+        Test that a batch whose detail disappeared is sent in full, also to a client that only sends If-Modified-Since.
+        """
+        other_offer = Offer.objects.create(title="Other offer", description="Batch Test", user=self.user)
+        other_detail = OfferDetail.objects.create(offer=other_offer, title="basic", revisions=1, delivery_time_in_days=3, price=10, features=[], offer_type="basic")
+        params = {'ids': self.ids(self.details[0], other_detail)}
+        etag = self.client.get(self.url, params)['ETag']
+        other_offer.delete()
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([detail['id'] for detail in response.data], [self.details[0].id])
+        response = self.client.get(self.url, params, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_id_lists(self):
+        """
+        Test that missing, malformed, out of range and too long id lists are rejected.
+        """
+        for ids in ['', 'a,b', ','.join(str(pk) for pk in range(1, 52)), '1,99999999999999999999999', '0', '-1']:
+            response = self.client.get(self.url, {'ids': ids})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.url, {'ids': self.ids(*self.details)}).status_code, status.HTTP_401_UNAUTHORIZED)
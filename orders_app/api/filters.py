@@ -0,0 +1,28 @@
+import django_filters
+
+from ..models import Order, OrderStatus
+
+ROLE_FIELDS = {'customer': 'customer_user', 'business': 'business_user'}
+
+
+class OrderFilter(django_filters.FilterSet):
+    """
+    Filter set for the order list: by status, by a creation date range and by the role of the user in the order.
+    """
+    status = django_filters.ChoiceFilter(choices=OrderStatus.choices, label="Status")
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte', label="Erstellt ab")
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt', label="Erstellt vor")
+    role = django_filters.ChoiceFilter(
+        choices=[(role, role) for role in ROLE_FIELDS], method='filter_role', label="Rolle"
+    )
+
+    class Meta:
+        model = Order
+        fields = []
+
+    def filter_role(self, queryset, name, value):
+        """
+        The role is applied by the view, which only builds the branch of the requested role.
+        The filter validates the value.
+        """
+        return queryset
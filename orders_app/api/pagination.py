@@ -0,0 +1,9 @@
+from offers_app.api.pagination import KeysetPagination
+
+
+class OrderKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination for the order list, newest first, keyed on `created_at` with `id` as tiebreaker.
+    """
+    ordering_fields = ['created_at']
+    default_ordering = '-created_at'
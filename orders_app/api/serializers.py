@@ -1,8 +1,8 @@
 from rest_framework import serializers
-from django.shortcuts import get_object_or_404
-from django.contrib.auth import get_user_model
 
-from ..models import Order
+from coderr_core.params import MAX_ID
+
+from ..models import ORDER_STATUS_TRANSITIONS, Order, OrderStatus
 from offers_app.models import OfferDetail
 
 
@@ -11,7 +11,9 @@ class OrderSerializer(serializers.ModelSerializer):
     Serializer for handling the creation and update of orders.
     It handles validation, creation, and update logic for the order model.
     """
-    offer_detail_id = serializers.PrimaryKeyRelatedField(queryset=OfferDetail.objects.all(), write_only=True)
+    offer_detail_id = serializers.PrimaryKeyRelatedField(
+        queryset=OfferDetail.objects.select_related('offer__user'), write_only=True
+    )
 
     class Meta:
         model = Order
@@ -36,38 +38,58 @@ class OrderSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """
         Creates a new order based on the provided validated data.
+        The offer detail was loaded with its offer and owner in one joined query by `offer_detail_id` and the
+        customer is the authenticated request user, so the order is validated once, without the foreign key
+        lookups, and written with a single INSERT.
         """
         request_user = self.context['request'].user
         if not request_user.is_authenticated:
             raise serializers.ValidationError({"user": "Authentication is required."})
 
-        customer_user = get_object_or_404(get_user_model(), id=request_user.id)
-        offer_detail_id = validated_data.pop('offer_detail_id')
-        business_user = get_object_or_404(get_user_model(), id=offer_detail_id.offer.user.id)
-
-        order = Order.objects.create(
-            customer_user=customer_user,
-            business_user=business_user,
-            title=offer_detail_id.title,
-            revisions=offer_detail_id.revisions,
-            delivery_time_in_days=offer_detail_id.delivery_time_in_days,
-            price=offer_detail_id.price,
-            features=offer_detail_id.features,
-            offer_type=offer_detail_id.offer_type,
+        offer_detail = validated_data.pop('offer_detail_id')
+        order = Order(
+            customer_user=request_user,
+            business_user=offer_detail.offer.user,
+            title=offer_detail.title,
+            revisions=offer_detail.revisions,
+            delivery_time_in_days=offer_detail.delivery_time_in_days,
+            price=offer_detail.price,
+            features=offer_detail.features,
+            offer_type=offer_detail.offer_type,
             status="in_progress"
         )
+        order.full_clean(exclude=['customer_user', 'business_user'])
+        order.save(force_insert=True, validate=False)
         return order
 
     def update(self, instance, validated_data):
         """
         Override the update method to allow only the 'status' field to be updated.
-        If other fields are provided, a validation error is raised.
+        If other fields are provided, a validation error is raised. The order is saved once.
         """
         if set(validated_data.keys()) != {"status"}:
             raise serializers.ValidationError("Only the 'status' field is allowed to be updated.")
-        status = validated_data.pop('status', None)
-        instance = super().update(instance, validated_data)
-        if status:
-            instance.status = status
-            instance.save()
+        instance.status = validated_data['status']
+        instance.save()  # writes the status and `updated_at` and moves the order between the status counters
         return instance
+
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    Validates a bulk status change: up to `max_ids` distinct order ids and a status that orders can be moved to.
+    """
+    max_ids = 100
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=MAX_ID), allow_empty=False, max_length=max_ids
+    )
+    status = serializers.ChoiceField(choices=[
+        choice for choice in OrderStatus.choices
+        if any(choice[0] in targets for targets in ORDER_STATUS_TRANSITIONS.values())
+    ])
+
+    def validate_ids(self, value):
+        """
+        Drops duplicate ids, keeping the requested order.
+        """
+        return list(dict.fromkeys(value))
@@ -1,12 +1,19 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Count, Q
 from django.contrib.auth import get_user_model
 
-from ..models import Order
-from .serializers import OrderSerializer
+from coderr_core.params import parse_id_list
+
+from ..models import Order, OrderStatus
+from ..stats import STATUS_FIELDS
+from ..transitions import bulk_transition
+from .filters import ROLE_FIELDS, OrderFilter
+from .pagination import OrderKeysetPagination
+from .serializers import OrderBulkStatusSerializer, OrderSerializer
 from .permissions import IsCustomerOrBusinessUserOrAdmin
 
 
@@ -18,20 +25,81 @@ class OrderViewSet(viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated, IsCustomerOrBusinessUserOrAdmin]
+    filterset_class = OrderFilter
+    keyset_pagination_class = OrderKeysetPagination
+
+    @property
+    def paginator(self):
+        """
+        Returns no paginator by default, so the list stays a plain array, and the keyset paginator
+        when the request opts in with `?pagination=cursor`.
+        """
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = None
+        return self._paginator
 
     def get_queryset(self):
         """
         Override the default queryset to filter orders based on the authenticated user.
         Returns orders related to the user, either as a customer or a business user.
+        The orders of each role are selected by their own branch on the role's (user, created_at) index
+        and the branches are combined with UNION, instead of an OR across both columns that no single
+        index can serve. With `?role=customer|business` only that branch is queried.
         """
         queryset = super().get_queryset()
 
         if self.request.method == "GET":
-            queryset = queryset.filter(
-                Q(customer_user=self.request.user) | Q(business_user=self.request.user)
-            )
+            role_fields = list(ROLE_FIELDS.values())
+            if self.action == 'list' and self.request.query_params.get('role') in ROLE_FIELDS:
+                role_fields = [ROLE_FIELDS[self.request.query_params['role']]]
+            branches = [
+                Order.objects.filter(**{field: self.request.user}).values('id') for field in role_fields
+            ]
+            queryset = queryset.filter(id__in=branches[0].union(*branches[1:]))
         return queryset
 
+    def filter_queryset(self, queryset):
+        """
+        Applies the filters to the list only, single orders are looked up by id alone.
+        """
+        if self.action != 'list':
+            return queryset
+        return super().filter_queryset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns the user's orders, as a plain list or, with `?pagination=cursor`, as a keyset page.
+        With `?summary=true` the response also contains the number of filtered orders per status,
+        computed with one aggregate query in the same request; the unpaginated list is then returned
+        under `results`.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        summary = None
+        if request.query_params.get('summary') in ('1', 'true'):
+            summary = self.get_status_summary(queryset)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        else:
+            data = self.get_serializer(queryset, many=True).data
+            response = Response(data if summary is None else {'results': data})
+        if summary is not None:
+            response.data['summary'] = summary
+        return response
+
+    def get_status_summary(self, queryset):
+        """
+        Counts the orders of the queryset per status, plus their total, in a single query.
+        """
+        return queryset.order_by().aggregate(
+            **{field: Count('id', filter=Q(status=field)) for field in STATUS_FIELDS},
+            total=Count('id'),
+        )
+
     def update(self, request, *args, **kwargs):
         """
         Override the update method to handle partial updates (PATCH requests) for an order.
@@ -44,48 +112,103 @@ class OrderViewSet(viewsets.ModelViewSet):
         self.perform_update(serializer)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'], url_path='bulk-status', permission_classes=[IsAuthenticated])
+    def bulk_status(self, request):
+        """
+        Moves many orders of the requesting business user to a new status at once:
+        `POST /api/orders/bulk-status/` with `{"ids": [...], "status": "completed"}`.
+        Only in-progress orders can be completed or cancelled. The allowed orders are written with one conditional
+        UPDATE and the order counters are adjusted once for the batch; the outcome of every requested id is
+        returned in the requested order.
+        """
+        if request.user.type != 'business':
+            return Response(
+                {"detail": "Only business users can change the status of their orders."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        outcomes = bulk_transition(request.user, serializer.validated_data['ids'], serializer.validated_data['status'])
+        return Response({
+            "status": serializer.validated_data['status'],
+            "results": [
+                {"id": order_id, "outcome": outcome, "status": order_status}
+                for order_id, (outcome, order_status) in outcomes.items()
+            ],
+        })
+
 
-class OrderCountView(APIView):
+class BusinessOrderStatsView(APIView):
     """
-    API View to get the count of orders in 'in_progress' status for a given business user.
+    Base view for the order counts of a business user, served from the materialized `BusinessOrderStats` row.
     """
+    status_field = None
+    response_key = None
+
     def get(self, request, business_user_id):
         """
-        Retrieve the count of orders that are 'in_progress' for a specific business user.
-        The business user is identified by the `business_user_id` parameter.
+        Returns the counter of `status_field` for the business user identified by `business_user_id`.
+        The user type and the counter are read with one primary-key lookup; a business user without
+        orders has no counter row yet and counts 0.
         """
-        try:
-            user = get_user_model().objects.get(id=business_user_id, type="business")
-        except get_user_model().DoesNotExist:
+        counts = list(
+            get_user_model().objects.filter(id=business_user_id, type="business")
+            .values_list(f"order_stats__{self.status_field}", flat=True)
+        )
+        if not counts:
             return Response(
                 {"detail": "A business user with the provided ID could not be found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        return Response({self.response_key: counts[0] or 0})
 
-        order_count = Order.objects.aggregate(
-            order_count=Count("id", filter=Q(business_user=user.id, status="in_progress"))
-        )
-        return Response(order_count)
+
+class OrderCountView(BusinessOrderStatsView):
+    """
+    API View to get the count of orders in 'in_progress' status for a given business user.
+    """
+    status_field = OrderStatus.IN_PROGRESS
+    response_key = "order_count"
 
 
-class CompletedOrderCountView(APIView):
+class CompletedOrderCountView(BusinessOrderStatsView):
     """
     API View to get the count of completed orders for a given business user.
     """
-    def get(self, request, business_user_id):
+    status_field = OrderStatus.COMPLETED
+    response_key = "completed_order_count"
+
+
+class OrderCountsView(APIView):
+    """
+    API View to get the in-progress and completed order counts of many business users at once, e.g. for the
+    business directory: `GET /api/order-counts/?business_user_ids=1,2,3`.
+    """
+    max_ids = 100
+
+    def get(self, request):
         """
-        Retrieve the count of orders that are 'completed' for a specific business user.
-        The business user is identified by the `business_user_id` parameter.
+        Returns the counts of the requested business users in the requested order, read together with the user
+        type check in a single query from the materialized counters. Ids that do not belong to a business user
+        are listed under `not_found`.
         """
-        try:
-            user = get_user_model().objects.get(id=business_user_id, type="business")
-        except get_user_model().DoesNotExist:
-            return Response(
-                {"detail": "A business user with the provided ID could not be found."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        completed_order_count = Order.objects.aggregate(
-            completed_order_count=Count("id", filter=Q(business_user=user.id, status="completed"))
-        )
-
-        return Response(completed_order_count)
+        ids, error = parse_id_list(request.query_params.get('business_user_ids', ''), self.max_ids)
+        if error:
+            return Response({"business_user_ids": error}, status=status.HTTP_400_BAD_REQUEST)
+        counts = {
+            business_user_id: (order_count, completed_order_count)
+            for business_user_id, order_count, completed_order_count in
+            get_user_model().objects.filter(id__in=ids, type="business")
+            .values_list("id", f"order_stats__{OrderStatus.IN_PROGRESS}", f"order_stats__{OrderStatus.COMPLETED}")
+        }
+        return Response({
+            "results": [
+                {
+                    "business_user_id": business_user_id,
+                    "order_count": counts[business_user_id][0] or 0,
+                    "completed_order_count": counts[business_user_id][1] or 0,
+                }
+                for business_user_id in ids if business_user_id in counts
+            ],
+            "not_found": [business_user_id for business_user_id in ids if business_user_id not in counts],
+        })
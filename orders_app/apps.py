@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class OrdersAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'orders_app'
+
+    def ready(self):
+        """
+        Connects the signal receivers that keep the per-business order counters in sync.
+        """
+        from . import stats  # noqa: F401
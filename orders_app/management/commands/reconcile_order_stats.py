@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from orders_app.stats import find_drift, repair_drift
+
+
+class Command(BaseCommand):
+    """
+    Compares the materialized per-business order counters with the orders table and repairs drifted counters,
+    e.g. after orders were written with queryset updates or raw SQL that bypass the model signals.
+    """
+    help = "Detects and repairs drift of the per-business order counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report the drifted counters.")
+
+    def handle(self, *args, **options):
+        drift = find_drift()
+        for business_user_id, (stored_counts, actual_counts) in sorted(drift.items()):
+            self.stdout.write(f"Business user {business_user_id}: stored {stored_counts}, actual {actual_counts}")
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("All order counters are in sync."))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Found {len(drift)} drifted business user(s)."))
+        else:
+            repair_drift(drift)
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(drift)} drifted business user(s)."))
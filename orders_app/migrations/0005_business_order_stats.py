@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_order_stats(apps, schema_editor):
+    """
+    Fills the counters from the existing orders.
+    """
+    Order = apps.get_model('orders_app', 'Order')
+    BusinessOrderStats = apps.get_model('orders_app', 'BusinessOrderStats')
+    db_alias = schema_editor.connection.alias
+    statuses = ['in_progress', 'completed', 'cancelled']
+    rows = (
+        Order.objects.using(db_alias).filter(business_user__isnull=False).order_by().values('business_user')
+        .annotate(**{status: Count('id', filter=Q(status=status)) for status in statuses})
+    )
+    BusinessOrderStats.objects.using(db_alias).bulk_create(
+        [BusinessOrderStats(business_user_id=row.pop('business_user'), **row) for row in rows], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0004_order_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderStats',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(build_order_stats, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 
+from coderr_core.mixins import DirtyFieldsMixin
+
 # Create your models here.
 
 
@@ -11,9 +13,16 @@ class OrderStatus(models.TextChoices):
     CANCELLED = 'cancelled', 'Cancelled'
 
 
-class Order(models.Model):
+# Status changes allowed by the bulk status endpoint, by current status
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.IN_PROGRESS: {OrderStatus.COMPLETED, OrderStatus.CANCELLED},
+}
+
+
+class Order(DirtyFieldsMixin, models.Model):
     """
     Represents a service order between a customer and a business user.
+    The loaded field values are tracked, so that the order statistics receivers can tell a status change.
     """
     customer_user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="customer_orders", on_delete=models.SET_NULL, null=True)
     business_user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="business_orders", on_delete=models.SET_NULL, null=True)
@@ -27,23 +36,47 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def save(self, *args, **kwargs):
+    class Meta:
+        # Order counts per business user and status, and the per-role order lists by creation date
+        indexes = [
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            models.Index(fields=['business_user', 'created_at'], name='order_business_created_idx'),
+            models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+        ]
+
+    def save(self, *args, validate=True, **kwargs):
         """
-        Validates offer_type and status before saving.
+        Validates the order (including offer_type and status choices) before saving, unless the caller already
+        validated it and passes `validate=False`.
         """
-        self.full_clean()
-        valid_types = dict(self._meta.get_field("offer_type").choices)
-        if self.offer_type not in valid_types:
-            raise ValueError(f"Invalid offer_type: {self.offer_type}")
+        if validate:
+            self.full_clean()
 
-        valid_status_types = dict(self._meta.get_field("status").choices)
-        if self.status not in valid_status_types:
-            raise ValueError(f"Invalid status: {self.status}")
-
-        super().save(*args, **kwargs)
+        # The order and its business user's counters are written together, without an extra savepoint
+        # when the caller already runs in a transaction
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         """
         Returns a readable identifier for the order.
         """
         return f"{self.customer_user.username}, order({self.id})"
+
+
+class BusinessOrderStats(models.Model):
+    """
+    Materialized number of orders per status for a business user, served by the order count endpoints
+    with a primary-key lookup. Kept in sync by the signal receivers in `orders_app.stats` within the
+    transaction of the order write; `reconcile_order_stats` detects and repairs drift.
+    """
+    business_user = models.OneToOneField(settings.AUTH_USER_MODEL, primary_key=True, related_name='order_stats', on_delete=models.CASCADE)
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+
+    def __str__(self):
+        """
+        Returns the business user id with the order counts per status.
+        """
+        return f"Business User {self.business_user_id}: {self.in_progress} in progress, {self.completed} completed, {self.cancelled} cancelled"
@@ -0,0 +1,103 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import BusinessOrderStats, Order, OrderStatus
+
+STATUS_FIELDS = [status.value for status in OrderStatus]
+
+
+def apply_delta(business_user_id, status, delta, using='default'):
+    """
+    Adds `delta` to the business user's counter of the status, creating the statistics row on first use.
+    """
+    apply_deltas(business_user_id, {status: delta}, using)
+
+
+def apply_deltas(business_user_id, deltas, using='default'):
+    """
+    Adds the deltas by status to the business user's counters with one UPDATE, creating the statistics row
+    on first use.
+    """
+    deltas = {status: delta for status, delta in deltas.items() if status in STATUS_FIELDS and delta}
+    if business_user_id is None or not deltas:
+        return
+    stats = BusinessOrderStats.objects.using(using).filter(pk=business_user_id)
+    if stats.update(**{status: F(status) + delta for status, delta in deltas.items()}):
+        return
+    try:
+        with transaction.atomic(using=using):
+            BusinessOrderStats.objects.using(using).create(business_user_id=business_user_id, **deltas)
+    except IntegrityError:  # created concurrently
+        stats.update(**{status: F(status) + delta for status, delta in deltas.items()})
+
+
+def count_orders(business_user_ids=None, using='default'):
+    """
+    Counts the orders per status of every business user (or the given ones) from the orders table.
+    Returns a dict of business user id to a dict of counts per status.
+    """
+    orders = Order.objects.using(using).filter(business_user__isnull=False)
+    if business_user_ids is not None:
+        orders = orders.filter(business_user__in=business_user_ids)
+    rows = orders.order_by().values('business_user').annotate(
+        **{status: Count('id', filter=Q(status=status)) for status in STATUS_FIELDS}
+    )
+    return {row.pop('business_user'): row for row in rows}
+
+
+def find_drift(using='default'):
+    """
+    Compares the materialized counters with the orders table. Returns a dict of business user id to
+    (stored counts or None, actual counts) for every business user whose counters are off.
+    """
+    actual = count_orders(using=using)
+    stored = {
+        row.pop('business_user'): row
+        for row in BusinessOrderStats.objects.using(using).values('business_user', *STATUS_FIELDS)
+    }
+    empty = dict.fromkeys(STATUS_FIELDS, 0)
+    drift = {}
+    for business_user_id in actual.keys() | stored.keys():
+        actual_counts = actual.get(business_user_id, empty)
+        stored_counts = stored.get(business_user_id)
+        if (stored_counts or empty) != actual_counts:
+            drift[business_user_id] = (stored_counts, actual_counts)
+    return drift
+
+
+def repair_drift(drift, using='default'):
+    """
+    Overwrites the drifted counters with the actual counts.
+    """
+    with transaction.atomic(using=using):
+        for business_user_id, (stored_counts, actual_counts) in drift.items():
+            BusinessOrderStats.objects.using(using).update_or_create(
+                business_user_id=business_user_id, defaults=actual_counts
+            )
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, using, **kwargs):
+    """
+    Counts a new order, or moves a changed order between the counters of its old and new status
+    (and business user), using the values the order was loaded with.
+    """
+    if created or not instance.has_snapshot('status'):
+        if created:
+            apply_delta(instance.business_user_id, instance.status, 1, using)
+        return
+    old_business_user_id = instance.get_original_value('business_user', instance.business_user_id)
+    old_status = instance.get_original_value('status')
+    if (old_business_user_id, old_status) != (instance.business_user_id, instance.status):
+        apply_delta(old_business_user_id, old_status, -1, using)
+        apply_delta(instance.business_user_id, instance.status, 1, using)
+
+
+@receiver(post_delete, sender=Order)
+def count_deleted_order(sender, instance, using, **kwargs):
+    """
+    Removes a deleted order from the counters of its business user.
+    """
+    apply_delta(instance.business_user_id, instance.status, -1, using)
@@ -1,9 +1,12 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.core.management import call_command
 
-from ..models import Order
+from ..models import BusinessOrderStats, Order
 
 
 class OrderCountViewTest(APITestCase):
@@ -132,3 +135,110 @@ class CompletedOrderCountViewTest(APITestCase):
         self.client.logout()
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BusinessOrderStatsTest(APITestCase):
+    """
+    Tests for the materialized per-business order counters behind the count endpoints.
+    """
+    def setUp(self):
+        self.business_user = get_user_model().objects.create_user(username="biz", password="test", type="business")
+        self.other_business_user = get_user_model().objects.create_user(username="biz2", password="test", type="business")
+        self.customer_user = get_user_model().objects.create_user(username="cust", password="test", type="customer")
+        self.admin_user = get_user_model().objects.create_superuser(username="admin", password="test")
+        self.orders = [
+            Order.objects.create(customer_user=self.customer_user, business_user=self.business_user, title=title, revisions=1, delivery_time_in_days=3, price=100, offer_type="basic")
+            for title in ["A", "B", "C"]
+        ]
+        self.client.force_authenticate(user=self.business_user)
+
+    def counts(self, business_user):
+        stats = BusinessOrderStats.objects.filter(pk=business_user.pk).first()
+        return stats and (stats.in_progress, stats.completed, stats.cancelled)
+
+    def test_counters_follow_order_writes(self):
+        """
+        Ensure the counters are updated on create, status change and delete.
+        """
+        self.assertEqual(self.counts(self.business_user), (3, 0, 0))
+        response = self.client.patch(reverse('order-detail', kwargs={'pk': self.orders[0].pk}), {"status": "completed"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.orders[1].status = "cancelled"
+        self.orders[1].save()
+        self.orders[1].save()
+        self.assertEqual(self.counts(self.business_user), (1, 1, 1))
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.delete(reverse('order-detail', kwargs={'pk': self.orders[2].pk}))
+        self.assertEqual(self.counts(self.business_user), (0, 1, 1))
+        self.assertIsNone(self.counts(self.other_business_user))
+
+    def test_count_views_use_one_query(self):
+        """
+        Ensure both count endpoints answer from the counters with a single query, also without a counter row.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('order-count', kwargs={'business_user_id': self.business_user.id}))
+        self.assertEqual(response.data, {"order_count": 3})
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('completed-order-count', kwargs={'business_user_id': self.other_business_user.id}))
+        self.assertEqual(response.data, {"completed_order_count": 0})
+
+    def test_reconcile_command_repairs_drift(self):
+        """
+        Ensure the reconcile command reports drift caused by writes that bypass the signals and repairs it.
+        """
+        Order.objects.filter(pk=self.orders[0].pk).update(status="completed")
+        BusinessOrderStats.objects.filter(pk=self.business_user.pk).update(cancelled=5)
+        out = StringIO()
+        call_command("reconcile_order_stats", dry_run=True, stdout=out)
+        self.assertIn("Found 1 drifted business user(s).", out.getvalue())
+        self.assertEqual(self.counts(self.business_user), (3, 0, 5))
+        call_command("reconcile_order_stats", stdout=out)
+        self.assertEqual(self.counts(self.business_user), (2, 1, 0))
+        out = StringIO()
+        call_command("reconcile_order_stats", stdout=out)
+        self.assertIn("All order counters are in sync.", out.getvalue())
+
+
+class OrderCountsViewTest(APITestCase):
+    """
+    Tests for the batched order count endpoint for many business users.
+    """
+    def setUp(self):
+        self.business_users = [
+            get_user_model().objects.create_user(username=f"biz{index}", password="test", type="business") for index in range(3)
+        ]
+        self.customer_user = get_user_model().objects.create_user(username="cust", password="test", type="customer")
+        for business_user, statuses in zip(self.business_users, [["in_progress", "completed", "completed"], ["in_progress"], []]):
+            for order_status in statuses:
+                Order.objects.create(customer_user=self.customer_user, business_user=business_user, title="A", revisions=1, delivery_time_in_days=3, price=100, offer_type="basic", status=order_status)
+        self.url = reverse('order-counts')
+        self.client.force_authenticate(user=self.customer_user)
+
+    def test_counts_for_many_business_users_in_one_query(self):
+        """
+        Ensure the counts of all requested business users are returned in order with one query,
+        and unknown or non-business ids are reported.
+        """
+        first, second, third = self.business_users
+        ids = f"{third.id},{first.id},{self.customer_user.id},999,{second.id},{first.id}"
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'business_user_ids': ids})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {"business_user_id": third.id, "order_count": 0, "completed_order_count": 0},
+            {"business_user_id": first.id, "order_count": 1, "completed_order_count": 2},
+            {"business_user_id": second.id, "order_count": 1, "completed_order_count": 0},
+        ])
+        self.assertEqual(response.data['not_found'], [self.customer_user.id, 999])
+
+    def test_invalid_id_lists(self):
+        """
+        Ensure missing, malformed, out of range and too long id lists are rejected, as well as unauthenticated requests.
+        """
+        for ids in ['', '1,x', ','.join(str(pk) for pk in range(1, 102)), '1,99999999999999999999999']:
+            response = self.client.get(self.url, {'business_user_ids': ids})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.logout()
+        response = self.client.get(self.url, {'business_user_ids': self.business_users[0].id})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
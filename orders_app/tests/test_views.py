@@ -3,7 +3,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from orders_app.models import Order
+from orders_app.models import BusinessOrderStats, Order
 from offers_app.models import OfferDetail, Offer
 
 
@@ -69,6 +69,34 @@ class OrderViewSetTests(APITestCase):
         self.assertEqual(response.data['business_user'], self.user.id)
         self.assertEqual(response.data['status'], "in_progress")
 
+    def test_create_order_queries(self):
+        """
+        Ensure an order is created with one joined lookup of the offer detail, one INSERT
+        and the update of the business user's order counters, which exist after their first order.
+        """
+        self.assertTrue(BusinessOrderStats.objects.filter(pk=self.user.pk).exists())
+        self.client.force_authenticate(user=self.customer)
+        with self.assertNumQueries(3):
+            response = self.client.post(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual((order.customer_user, order.business_user), (self.customer, self.user))
+        self.assertEqual(order.title, self.offer_detail.title)
+        self.assertEqual(order.features, self.offer_detail.features)
+
+    def test_create_first_order_queries(self):
+        """
+        Ensure the first order of a business user additionally creates its counter row: the counter
+        UPDATE matches no row and is followed by the INSERT of the row within a savepoint, six queries in all.
+        """
+        BusinessOrderStats.objects.filter(pk=self.user.pk).delete()
+        self.client.force_authenticate(user=self.customer)
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        stats = BusinessOrderStats.objects.get(pk=self.user.pk)
+        self.assertEqual((stats.in_progress, stats.completed, stats.cancelled), (1, 0, 0))
+
     def test_only_customer_user_allowed_create_order(self):
         """
         Ensure only customer users can create orders; business users cannot.
@@ -174,3 +202,189 @@ class OrderViewSetTests(APITestCase):
         self.client.force_authenticate(user=admin)
         response = self.client.delete(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class OrderListTests(APITestCase):
+    """
+    Tests for the filters, the keyset pagination and the status summary of the order list.
+    """
+    def setUp(self):
+        """
+        Creates orders of a business user that is also the customer of another business user's order.
+        """
+        self.business_user = get_user_model().objects.create_user(username="biz", password="test", type="business")
+        self.other_business_user = get_user_model().objects.create_user(username="other", password="test", type="business")
+        self.customer = get_user_model().objects.create_user(username="cust", password="test", type="customer")
+        self.orders = [
+            Order.objects.create(
+                customer_user=self.customer, business_user=self.business_user, title=f"Order {index}", revisions=1,
+                delivery_time_in_days=3, price=100, offer_type="basic", status=order_status
+            )
+            for index, order_status in enumerate(["in_progress", "completed", "completed", "cancelled"])
+        ]
+        self.purchase = Order.objects.create(
+            customer_user=self.business_user, business_user=self.other_business_user, title="Purchase", revisions=1,
+            delivery_time_in_days=3, price=100, offer_type="basic"
+        )
+        Order.objects.create(
+            customer_user=self.customer, business_user=self.other_business_user, title="Unrelated", revisions=1,
+            delivery_time_in_days=3, price=100, offer_type="basic"
+        )
+        self.url = reverse('order-list')
+        self.client.force_authenticate(user=self.business_user)
+
+    def ids(self, results):
+        """Return the sorted ids of the listed orders."""
+        return sorted(order['id'] for order in results)
+
+    def test_list_contains_orders_of_both_roles(self):
+        """Ensure the list contains the orders of the user as business user and as customer."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ids(response.data), sorted(order.id for order in [*self.orders, self.purchase]))
+
+    def test_role_filter(self):
+        """Ensure the role filter limits the list to one role and rejects unknown roles."""
+        response = self.client.get(self.url, {'role': 'customer'})
+        self.assertEqual(self.ids(response.data), [self.purchase.id])
+        response = self.client.get(self.url, {'role': 'business'})
+        self.assertEqual(self.ids(response.data), sorted(order.id for order in self.orders))
+        response = self.client.get(self.url, {'role': 'admin'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_status_and_date_filters(self):
+        """Ensure the list can be filtered by status and creation date range."""
+        response = self.client.get(self.url, {'status': 'completed'})
+        self.assertEqual(self.ids(response.data), [self.orders[1].id, self.orders[2].id])
+        created_at = self.orders[2].created_at.isoformat()
+        response = self.client.get(self.url, {'role': 'business', 'created_after': created_at})
+        self.assertEqual(self.ids(response.data), [self.orders[2].id, self.orders[3].id])
+        response = self.client.get(self.url, {'role': 'business', 'created_before': created_at})
+        self.assertEqual(self.ids(response.data), [self.orders[0].id, self.orders[1].id])
+        response = self.client.get(self.url, {'status': 'unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_pagination_walks_all_orders_newest_first(self):
+        """Ensure the cursor pages return every order once, newest first."""
+        seen = []
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(order['id'] for order in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, [self.purchase.id, *reversed([order.id for order in self.orders])])
+
+    def test_summary(self):
+        """Ensure the summary counts the filtered orders per status with one extra query."""
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'summary': 'true', 'role': 'business'})
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertEqual(
+            response.data['summary'], {'in_progress': 1, 'completed': 2, 'cancelled': 1, 'total': 4}
+        )
+        response = self.client.get(self.url, {'summary': 'true', 'pagination': 'cursor', 'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+        self.assertEqual(response.data['summary']['total'], 5)
+
+    def test_retrieve_ignores_list_filters(self):
+        """Ensure the list filters do not apply to single orders."""
+        url = reverse('order-detail', kwargs={'pk': self.purchase.id})
+        response = self.client.get(url, {'status': 'completed', 'role': 'business'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class OrderBulkStatusTests(APITestCase):
+    """
+    Tests for the bulk status endpoint of the orders.
+    """
+    def setUp(self):
+        """
+        Creates in-progress, completed and cancelled orders of a business user and an order of another business user.
+        """
+        self.business_user = get_user_model().objects.create_user(username="biz", password="test", type="business")
+        self.other_business_user = get_user_model().objects.create_user(username="other", password="test", type="business")
+        self.customer = get_user_model().objects.create_user(username="cust", password="test", type="customer")
+        self.in_progress = [self.create_order(self.business_user) for _ in range(3)]
+        self.completed = self.create_order(self.business_user, "completed")
+        self.other_order = self.create_order(self.other_business_user)
+        self.url = reverse('order-bulk-status')
+        self.client.force_authenticate(user=self.business_user)
+
+    def create_order(self, business_user, order_status="in_progress"):
+        """Create an order of the business user for the customer."""
+        return Order.objects.create(
+            customer_user=self.customer, business_user=business_user, title="Order", revisions=1,
+            delivery_time_in_days=3, price=100, offer_type="basic", status=order_status
+        )
+
+    def counters(self, business_user):
+        """Return the in-progress, completed and cancelled counters of the business user."""
+        stats = BusinessOrderStats.objects.get(pk=business_user.pk)
+        return stats.in_progress, stats.completed, stats.cancelled
+
+    def test_bulk_complete_returns_outcome_per_id(self):
+        """Ensure only allowed orders of the user are completed and every id gets its outcome."""
+        ids = [self.in_progress[0].id, self.completed.id, self.other_order.id, 999999, self.in_progress[1].id]
+        response = self.client.post(self.url, {"ids": ids, "status": "completed"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {"id": self.in_progress[0].id, "outcome": "updated", "status": "completed"},
+            {"id": self.completed.id, "outcome": "invalid_transition", "status": "completed"},
+            {"id": self.other_order.id, "outcome": "not_found", "status": None},
+            {"id": 999999, "outcome": "not_found", "status": None},
+            {"id": self.in_progress[1].id, "outcome": "updated", "status": "completed"},
+        ])
+        self.assertEqual(
+            list(Order.objects.filter(business_user=self.business_user, status="completed").order_by('id').values_list('id', flat=True)),
+            [self.in_progress[0].id, self.in_progress[1].id, self.completed.id]
+        )
+        self.assertEqual(Order.objects.get(pk=self.other_order.id).status, "in_progress")
+        self.assertEqual(self.counters(self.business_user), (1, 3, 0))
+        self.assertEqual(self.counters(self.other_business_user), (1, 0, 0))
+
+    def test_bulk_cancel_then_complete_is_rejected(self):
+        """Ensure cancelled orders cannot be completed and the counters stay unchanged."""
+        ids = [order.id for order in self.in_progress]
+        self.client.post(self.url, {"ids": ids, "status": "cancelled"}, format='json')
+        self.assertEqual(self.counters(self.business_user), (0, 1, 3))
+        response = self.client.post(self.url, {"ids": ids, "status": "completed"}, format='json')
+        self.assertEqual({result['outcome'] for result in response.data['results']}, {"invalid_transition"})
+        self.assertEqual(self.counters(self.business_user), (0, 1, 3))
+
+    def test_query_count_does_not_depend_on_batch_size(self):
+        """Ensure a batch is read, written and counted with the same number of queries regardless of its size."""
+        with self.assertNumQueries(3):
+            self.client.post(self.url, {"ids": [self.in_progress[0].id], "status": "completed"}, format='json')
+        with self.assertNumQueries(3):
+            self.client.post(self.url, {"ids": [order.id for order in self.in_progress[1:]], "status": "completed"}, format='json')
+
+    def test_invalid_requests(self):
+        """Ensure unreachable statuses and empty, malformed, out of range or too long id lists are rejected."""
+        for data in [
+            {"ids": [self.in_progress[0].id], "status": "in_progress"},
+            {"ids": [], "status": "completed"},
+            {"ids": ["abc"], "status": "completed"},
+            {"ids": list(range(1, 102)), "status": "completed"},
+            {"ids": [2 ** 63], "status": "completed"},
+        ]:
+            response = self.client.post(self.url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+
+    def test_out_of_range_id_is_rejected(self):
+        """Ensure an id beyond the 64-bit primary key range is rejected with 400 before reaching the database."""
+        response = self.client.post(self.url, {"ids": [self.in_progress[0].id, 2 ** 63], "status": "completed"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ids", response.data)
+        self.assertEqual(Order.objects.get(pk=self.in_progress[0].id).status, "in_progress")
+
+    def test_only_business_users_can_change_statuses(self):
+        """Ensure customers and anonymous users cannot change order statuses."""
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.post(self.url, {"ids": [self.in_progress[0].id], "status": "completed"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, {"ids": [self.in_progress[0].id], "status": "completed"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,53 @@
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ORDER_STATUS_TRANSITIONS, Order
+from .stats import apply_deltas
+
+UPDATED, NOT_FOUND, INVALID_TRANSITION = 'updated', 'not_found', 'invalid_transition'
+
+
+def get_source_statuses(target):
+    """
+    Returns the statuses from which an order may be moved to the target status.
+    """
+    return [status for status, targets in ORDER_STATUS_TRANSITIONS.items() if target in targets]
+
+
+def bulk_transition(business_user, order_ids, target, using='default'):
+    """
+    Moves the given orders of the business user to the target status where the transition is allowed.
+    Returns a dict of order id to (outcome, current status or None); orders of other users count as not found.
+
+    The current statuses are read with one locking query, the allowed orders are written with a single UPDATE
+    that repeats the ownership and transition conditions, and the business user's order counters are adjusted
+    with one UPDATE for the whole batch. `Order.save` and its signals are bypassed.
+    """
+    sources = get_source_statuses(target)
+    with transaction.atomic(using=using, savepoint=False):
+        current = dict(
+            Order.objects.using(using).select_for_update()
+            .filter(id__in=order_ids, business_user=business_user).values_list('id', 'status')
+        )
+        allowed = [order_id for order_id, status in current.items() if status in sources]
+        if allowed:
+            Order.objects.using(using).filter(id__in=allowed, business_user=business_user, status__in=sources).update(
+                status=target, updated_at=timezone.now()
+            )
+            deltas = Counter()
+            for order_id in allowed:
+                deltas[current[order_id]] -= 1
+                deltas[target] += 1
+            apply_deltas(business_user.pk, deltas, using)
+
+    outcomes = {}
+    for order_id in order_ids:
+        if order_id not in current:
+            outcomes[order_id] = (NOT_FOUND, None)
+        elif current[order_id] in sources:
+            outcomes[order_id] = (UPDATED, target)
+        else:
+            outcomes[order_id] = (INVALID_TRANSITION, current[order_id])
+    return outcomes
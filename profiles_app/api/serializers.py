@@ -2,15 +2,26 @@ from rest_framework import serializers
 from ..models import UserProfile
 import os
 from user_auth_app.api.serializers import CustomUserSerializer
+from coderr_core.images import derivative_urls
 
 
-class BusinessProfileSerializer(serializers.ModelSerializer):
+class FileDerivativesMixin(serializers.Serializer):
+    """
+    Adds the URLs of the thumbnail and card-size renditions of the profile image once they are ready.
+    """
+    file_derivatives = serializers.SerializerMethodField()
+
+    def get_file_derivatives(self, obj):
+        return derivative_urls(obj.file_derivatives, self.context.get('request'))
+
+
+class BusinessProfileSerializer(FileDerivativesMixin, serializers.ModelSerializer):
     """
     Handles validation, representation, and updating of business-related profile information.
     """
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'created_at', 'type', 'location', 'tel', 'description', 'working_hours', 'email']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'created_at', 'type', 'location', 'tel', 'description', 'working_hours', 'email', 'file_derivatives']
         extra_kwargs = {
             'file': {'required': False},
             'uploaded_at': {'required': False},
@@ -53,7 +64,7 @@ class BusinessProfileSerializer(serializers.ModelSerializer):
         return instance
 
 
-class BusinessProfileListSerializer(serializers.ModelSerializer):
+class BusinessProfileListSerializer(FileDerivativesMixin, serializers.ModelSerializer):
     """
     Handles validation, representation, and updating of business-related profile information.
     """
@@ -61,20 +72,20 @@ class BusinessProfileListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'created_at', 'type', 'location', 'tel', 'description', 'working_hours', 'email']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'created_at', 'type', 'location', 'tel', 'description', 'working_hours', 'email', 'file_derivatives']
         extra_kwargs = {
             'file': {'required': False},
             'uploaded_at': {'required': False},
         }
 
 
-class CustomerProfileSerializer(serializers.ModelSerializer):
+class CustomerProfileSerializer(FileDerivativesMixin, serializers.ModelSerializer):
     """
     Handles validation, representation, and updating of customer-related profile information.
     """
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type', 'email', 'created_at']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type', 'email', 'created_at', 'file_derivatives']
         extra_kwargs = {
             'file': {'required': False},
             'uploaded_at': {'required': False},
@@ -113,7 +124,7 @@ class CustomerProfileSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CustomerProfileListSerializer(serializers.ModelSerializer):
+class CustomerProfileListSerializer(FileDerivativesMixin, serializers.ModelSerializer):
     """
     Handles validation, representation, and updating of customer-related profile information.
     """
@@ -121,7 +132,7 @@ class CustomerProfileListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type', 'email', 'created_at']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type', 'email', 'created_at', 'file_derivatives']
         extra_kwargs = {
             'file': {'required': False},
             'uploaded_at': {'required': False},
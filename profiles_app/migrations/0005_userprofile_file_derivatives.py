@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0004_alter_userprofile_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='file_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-17 07:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0005_userprofile_file_derivatives'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['type'], name='userprofile_type_idx'),
+        ),
+    ]
@@ -7,12 +7,14 @@ from django.core.files.storage import default_storage
 from django.dispatch import receiver
 from django.db.models.signals import post_delete
 
+from coderr_core.images import delete_image_derivatives, delete_stored_derivatives, schedule_image_derivatives
+from coderr_core.mixins import DirtyFieldsMixin
 from .api.utils import validate_file_size
 
 # Create your models here.
 
 
-class UserProfile(models.Model):
+class UserProfile(DirtyFieldsMixin, models.Model):
     """
     Extends the CustomUser model with additional profile details.
     """
@@ -29,51 +31,53 @@ class UserProfile(models.Model):
     tel = models.CharField(max_length=25, blank=True, null=True, default="")
     description = models.TextField(max_length=255, blank=True, null=True, default="")
     working_hours = models.CharField(max_length=100, blank=True, null=True, default="")
+    file_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        # Business and customer profile lists filter by type
+        indexes = [
+            models.Index(fields=['type'], name='userprofile_type_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         """
         Saves the UserProfile instance. Auto-fills missing fields (first name, last name, email, and username) 
         from the associated user if not already provided. Handles file replacement by deleting the old file 
         and renaming the new file, if necessary. Updates the uploaded_at timestamp when the file is updated.
+        Changes are detected from the loaded field values, so neither the profile row is re-read nor the user
+        saved unless a synced field changed. Derivatives of the replaced file are deleted and those of a new
+        upload are rendered in the background.
         """
-        if self.id:
-            original = UserProfile.objects.get(pk=self.id)
-            if original.file.name != self.file.name:  # Check if the file has been changed
+        file_uploaded = bool(self.file) and not self.file._committed
+        if self.pk and self.has_snapshot('file'):
+            if self.is_dirty('file'):  # Check if the file has been changed
                 # If the file is changed, delete the old file
-                if original.file:
-                    old_file_path = original.file.path
-                    if os.path.exists(old_file_path):
-                        default_storage.delete(old_file_path)
+                original_file = self.get_original_value('file')
+                if original_file:
+                    if default_storage.exists(original_file):
+                        default_storage.delete(original_file)
                     self.update_file()
+                delete_stored_derivatives(self, 'file_derivatives')
             if self.file and self.uploaded_at is None:
                 self.update_file()
 
-        if self.user:
-            if not self.first_name:
-                self.first_name = self.user.first_name
-            if not self.last_name:
-                self.last_name = self.user.last_name
-            if not self.email:
-                self.email = self.user.email
-            if not self.username:
-                self.username = self.user.username
+        if self.user_id:
+            # Only new or changed profile fields can differ from the user, so untouched saves skip the user
+            for field_name in ('first_name', 'last_name', 'email', 'username'):
+                if not getattr(self, field_name) and self.is_dirty(field_name):
+                    setattr(self, field_name, getattr(self.user, field_name))
 
-            changed = False
-            if self.first_name != self.user.first_name:
-                self.user.first_name = self.first_name
-                changed = True
-            if self.last_name != self.user.last_name:
-                self.user.last_name = self.last_name
-                changed = True
-            if self.email != self.user.email:
-                self.user.email = self.email
-                changed = True
-            if self.file != self.user.file:
-                self.user.file = self.file
-                changed = True
-            if changed:
-                self.user.save()
+            user_fields = [
+                field_name for field_name in ('first_name', 'last_name', 'email', 'file')
+                if self.is_dirty(field_name) and getattr(self, field_name) != getattr(self.user, field_name)
+            ]
+            for field_name in user_fields:
+                setattr(self.user, field_name, getattr(self, field_name))
+            if user_fields:
+                self.user.save(update_fields=user_fields)
         super(UserProfile, self).save(*args, **kwargs)
+        if file_uploaded:
+            schedule_image_derivatives(self, 'file', 'file_derivatives')
 
     def update_file(self):
         """
@@ -99,10 +103,11 @@ class UserProfile(models.Model):
 @receiver(post_delete, sender=UserProfile)
 def delete_profile_file(sender, instance, **kwargs):
     """
-    Deletes the associated file from storage when a UserProfile instance is deleted.
+    Deletes the associated file and its derivatives from storage when a UserProfile instance is deleted.
     """
     if instance.file:
         file_path = instance.file.path
         if os.path.exists(file_path):
             default_storage.delete(file_path)
+    delete_image_derivatives(instance.file_derivatives)
 
@@ -1,5 +1,10 @@
+import io
 import os
-from django.test import TestCase
+import tempfile
+
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 
@@ -101,4 +106,57 @@ class UserProfileModelTests(TestCase):
         file_path = self.profile.file.path
         self.profile.delete()
         self.assertFalse(os.path.exists(file_path))
-        self.user.delete()
\ No newline at end of file
+        self.user.delete()
+
+
+class UserProfileDirtyFieldTests(TestCase):
+    """Test suite for the change detection of loaded profiles."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="testuser", password="testpassword", first_name="Test", type="customer")
+        UserProfile.objects.create(user=self.user, type=self.user.type)
+        self.profile = UserProfile.objects.get(user=self.user)
+
+    def test_save_without_synced_changes_skips_user(self):
+        """Ensure saving unsynced fields neither re-reads the profile nor loads or saves the user."""
+        self.profile.location = "Berlin"
+        with self.assertNumQueries(1):
+            self.profile.save()
+        self.assertEqual(UserProfile.objects.get(pk=self.profile.pk).location, "Berlin")
+
+    def test_synced_field_saves_user_fields_only(self):
+        """Ensure a changed name is written to the user with a field-limited update."""
+        self.profile.first_name = "Changed"
+        with self.assertNumQueries(3):  # load user, update user, update profile
+            self.profile.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Changed")
+
+
+@override_settings(IMAGE_PIPELINE_EAGER=True)
+class UserProfileFileDerivativeTests(TestCase):
+    """Test suite for the derivatives rendered after a profile image upload."""
+
+    def setUp(self):
+        self.enterContext(override_settings(MEDIA_ROOT=tempfile.mkdtemp()))
+        self.user = get_user_model().objects.create_user(username="testuser", password="testpassword", type="business")
+        self.profile = UserProfile.objects.create(user=self.user, type=self.user.type)
+
+    def upload_file(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 400), color='teal').save(buffer, format='JPEG')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.file = SimpleUploadedFile("avatar.jpg", buffer.getvalue(), content_type="image/jpeg")
+            self.profile.save()
+        self.profile.refresh_from_db()
+        return self.profile.file_derivatives
+
+    def test_derivatives_rendered_and_replaced(self):
+        """Ensure derivatives are stored after an upload and deleted when the file is replaced."""
+        derivatives = self.upload_file()
+        self.assertIn('thumbnail', derivatives)
+        self.assertTrue(all(default_storage.exists(name) for name in derivatives.values()))
+        self.profile.file = SimpleUploadedFile("other.jpg", b"new_file_content", content_type="image/jpeg")
+        self.profile.save()
+        self.assertEqual(self.profile.file_derivatives, {})
+        self.assertFalse(any(default_storage.exists(name) for name in derivatives.values()))
@@ -11,6 +11,11 @@ class Review(models.Model):
     """
     class Meta:
         unique_together = ('business_user', 'reviewer')
+        # Reviews filtered by business user or reviewer and ordered by `-updated_at` (the default ordering)
+        indexes = [
+            models.Index(fields=['business_user', '-updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['reviewer', '-updated_at'], name='review_reviewer_updated_idx'),
+        ]
 
     business_user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="business_reviews", on_delete=models.CASCADE)
     reviewer = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="customer_reviews", on_delete=models.CASCADE)